@@ -2,14 +2,27 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
 import pandas as pd
 import argparse
+import base64
 import os
+import uuid
+
+from accounting import from_cents, profits_cents, to_cents, win_cents
+from figure_cache import FigureCache
+from result_store import ResultStore
+from roll_log import RollLog
+from sim_metrics import simulate_run
 
 # Interactive Dice-style Color Game
 # - Animates a rolling die (unicode faces)
 # - Supports Fair and Tweaked probability modes
 # - Tracks player profit and history, can show plots
+# - Live cumulative profit chart embedded in the window
+# - Auto-roll plays many rounds at once with a capped display refresh rate
+# - Rolls are kept in the persistent roll log; the last session is restored on start
 
 colors = ["Red", "Blue", "Yellow", "Green", "White", "Purple"]
 fair_probabilities = [1/6] * 6
@@ -26,23 +39,156 @@ COLOR_HEX = {
     "Purple": "#9b59b6",
 }
 
+LIVE_CHART_INTERVAL_MS = 100  # minimum time between live chart redraws
+AUTO_ROLL_FPS = 30  # display refreshes per second during auto-roll
+AUTO_ROLL_BATCH = 500  # rounds applied per display refresh
+
+
+class LiveProfitChart:
+    """Cumulative profit chart embedded in a Tk container.
+
+    Points are appended in O(1) to growable buffers; redraws are coalesced
+    to at most one per LIVE_CHART_INTERVAL_MS and only blit the line over a
+    cached background, unless the axes need rescaling.
+    """
+
+    def __init__(self, master):
+        self.fig = Figure(figsize=(4, 2.2), dpi=100)
+        self.ax = self.fig.add_subplot()
+        self.ax.set_title("Cumulative Profit", fontsize=9)
+        self.ax.set_xlabel("Play Number", fontsize=8)
+        self.ax.tick_params(labelsize=7)
+        self.ax.axhline(0, color="gray", linestyle="--", linewidth=0.8)
+        self.fig.tight_layout()
+        (self.line,) = self.ax.plot([], [], color=COLOR_HEX["Blue"], linewidth=1.2, animated=True)
+
+        self.canvas = FigureCanvasTkAgg(self.fig, master=master)
+        self.widget = self.canvas.get_tk_widget()
+        # Any full draw (first show, resize, rescale) refreshes the blit background
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+
+        self._background = None
+        self._pending = False
+        self.clear()
+
+    def clear(self):
+        self._x = np.empty(1024)
+        self._y = np.empty(1024)
+        self._n = 0
+        self._last_x = 0
+        self._ymin = self._ymax = 0.0
+        self.line.set_data([], [])
+        self.ax.set_xlim(0, 50)
+        self.ax.set_ylim(-10, 10)
+        self.canvas.draw_idle()
+
+    def append(self, total):
+        """Add the running total after one more play; never draws synchronously"""
+        self.extend([total])
+
+    def extend(self, totals, play_numbers=None):
+        """Add the running totals after several plays at once.
+
+        play_numbers defaults to the plays following the last point; pass
+        them explicitly for downsampled data such as a restored session.
+        """
+        totals = np.asarray(totals, dtype=np.float64)
+        if totals.size == 0:
+            return
+        if play_numbers is None:
+            play_numbers = np.arange(self._last_x + 1, self._last_x + totals.size + 1)
+        end = self._n + totals.size
+        if end > self._x.size:
+            size = max(self._x.size * 2, end)
+            self._x = np.resize(self._x, size)
+            self._y = np.resize(self._y, size)
+        self._x[self._n:end] = play_numbers
+        self._y[self._n:end] = totals
+        self._n = end
+        self._last_x = int(play_numbers[-1])
+        self._ymin = min(self._ymin, float(totals.min()))
+        self._ymax = max(self._ymax, float(totals.max()))
+
+        if not self._pending:
+            self._pending = True
+            self.widget.after(LIVE_CHART_INTERVAL_MS, self._redraw)
+
+    def _on_draw(self, event):
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.ax.draw_artist(self.line)
+
+    def _rescale(self):
+        """Grow the axes with headroom if the data left them; True if they changed"""
+        x_hi = self.ax.get_xlim()[1]
+        y_lo, y_hi = self.ax.get_ylim()
+        if self._last_x <= x_hi and y_lo <= self._ymin and self._ymax <= y_hi:
+            return False
+        while self._last_x > x_hi:
+            x_hi *= 2
+        self.ax.set_xlim(0, x_hi)
+        span = max(self._ymax - self._ymin, 10.0)
+        self.ax.set_ylim(self._ymin - 0.25 * span, self._ymax + 0.25 * span)
+        return True
+
+    def _redraw(self):
+        self._pending = False
+        self.line.set_data(self._x[:self._n], self._y[:self._n])
+        if self._rescale() or self._background is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self._background)
+        self.ax.draw_artist(self.line)
+        self.canvas.blit(self.ax.bbox)
+
 
 class ColorDiceGame(tk.Tk):
     def __init__(self):
         super().__init__()
         self.title("Color Dice Game")
-        self.geometry("420x380")
+        self.geometry("420x620")
         self.resizable(False, False)
 
         self.mode = tk.StringVar(value="Fair")
         self.bet_amount = tk.IntVar(value=10)
-        self.total_profit = 0.0
+        self.auto_rounds = tk.IntVar(value=1000)
+        self._auto_active = False  # an auto-roll is applying its batches
+        self.total_cents = 0  # exact running total; total_profit is derived from it
         self.plays = 0
         self.history = []  # profit history
         self.outcome_history = []  # color outcomes
+        # Plays of a restored session that are only in the roll log; the
+        # plots read them from there when first asked for
+        self.unloaded_plays = 0
+        # Rendered plots are cached per history version until the next roll/reset
+        self.history_id = 0
+        self.figure_cache = FigureCache(max_bytes=8 * 1024 * 1024)
 
         self._build_ui()
 
+        # Pick up where the last desktop session left off
+        self.roll_log = RollLog()
+        self.log_session = self.roll_log.latest_session("desktop-") or f"desktop-{uuid.uuid4().hex}"
+        summary = self.roll_log.load_session(self.log_session)
+        if summary is not None:
+            self.total_cents = to_cents(summary["total_profit"])
+            self.plays = self.unloaded_plays = summary["plays"]
+            # End the chart at the last play, so later rolls are numbered from there
+            play_numbers, totals = summary["chart_x"], summary["chart_y"]
+            if len(play_numbers) == 0 or play_numbers[-1] != self.plays:
+                play_numbers = np.append(play_numbers, self.plays)
+                totals = np.append(totals, self.total_profit)
+            self.live_chart.extend(totals, play_numbers)
+            self._update_stats()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    @property
+    def total_profit(self):
+        return from_cents(self.total_cents)
+
+    def _on_close(self):
+        self.roll_log.close()
+        self.destroy()
+
     def _build_ui(self):
         frm = ttk.Frame(self, padding=12)
         frm.pack(fill="both", expand=True)
@@ -66,8 +212,13 @@ class ColorDiceGame(tk.Tk):
         ttk.Label(frm, text="Bet amount:").grid(row=3, column=0, sticky="w")
         ttk.Spinbox(frm, from_=1, to=1000, textvariable=self.bet_amount, width=8).grid(row=3, column=1, sticky="e")
 
-        self.roll_btn = ttk.Button(frm, text="Roll", command=self.start_roll)
-        self.roll_btn.grid(row=4, column=0, columnspan=2, pady=10)
+        rolls = ttk.Frame(frm)
+        rolls.grid(row=4, column=0, columnspan=2, pady=10)
+        self.roll_btn = ttk.Button(rolls, text="Roll", command=self.start_roll)
+        self.roll_btn.pack(side="left", padx=6)
+        self.auto_btn = ttk.Button(rolls, text="Auto-roll", command=self.start_auto_roll)
+        self.auto_btn.pack(side="left", padx=(6, 2))
+        ttk.Spinbox(rolls, from_=1, to=1000000, increment=100, textvariable=self.auto_rounds, width=8).pack(side="left")
 
         # Statistics
         self.profit_label = ttk.Label(frm, text=f"Total Profit: ${self.total_profit:.2f}")
@@ -79,13 +230,23 @@ class ColorDiceGame(tk.Tk):
         btns = ttk.Frame(frm)
         btns.grid(row=6, column=0, columnspan=2, pady=(12, 0))
         ttk.Button(btns, text="Show Plots", command=self.show_plots).pack(side="left", padx=6)
-        ttk.Button(btns, text="Reset", command=self.reset_game).pack(side="left", padx=6)
+        self.reset_btn = ttk.Button(btns, text="Reset", command=self.reset_game)
+        self.reset_btn.pack(side="left", padx=6)
+
+        # Live chart
+        self.live_chart = LiveProfitChart(frm)
+        self.live_chart.widget.grid(row=7, column=0, columnspan=2, pady=(12, 0))
 
         # Small footer
-        ttk.Label(frm, text="Close the window to exit.").grid(row=7, column=0, columnspan=2, pady=(18, 0))
+        ttk.Label(frm, text="Close the window to exit.").grid(row=8, column=0, columnspan=2, pady=(12, 0))
+
+    def _set_buttons(self, state):
+        for btn in (self.roll_btn, self.auto_btn, self.reset_btn):
+            btn.config(state=state)
 
     def start_roll(self):
-        self.roll_btn.config(state="disabled")
+        # No auto-roll or reset while the die is still spinning
+        self._set_buttons("disabled")
         self._animate_count = 18
         self._animate()
 
@@ -108,72 +269,151 @@ class ColorDiceGame(tk.Tk):
         mode = self.mode.get()
         probs = fair_probabilities if mode == "Fair" else tweaked_probabilities
         outcome = np.random.choice(colors, p=probs)
-        # map color to index for display
-        idx = colors.index(outcome)
-        # Color the die area to match outcome
-        bg = COLOR_HEX.get(outcome, "#ffffff")
-        fg = "#000000" if outcome == "White" or bg.lower() in ["#facc15"] else "#ffffff"
-        self.die_label.config(text=UNICODE_DICE[idx], bg=bg, fg=fg)
-        self.color_label.config(text=outcome)
+        self._show_outcome(outcome)
 
         bet = float(self.bet_amount.get())
         if outcome == "Red":
-            payout_multiplier = 2.0 if mode == "Fair" else 1.9
-            profit = bet * payout_multiplier - bet
+            profit_cents = win_cents(bet, self._payout_multiplier(mode) - 1)
         else:
-            profit = -bet
+            profit_cents = -to_cents(bet)
+        profit = from_cents(profit_cents)
 
-        self.total_profit += profit
+        self.total_cents += profit_cents
         self.plays += 1
         self.history.append(profit)
         self.outcome_history.append(outcome)
+        self._history_changed()
+        self.live_chart.append(self.total_profit)
+        self.roll_log.record(self.log_session, mode, None, bet, outcome, profit)
+
+        self._update_stats()
+
+        if not self._auto_active:
+            self._set_buttons("normal")
+
+    @staticmethod
+    def _payout_multiplier(mode):
+        return 2.0 if mode == "Fair" else 1.9
 
+    def _show_outcome(self, outcome):
+        # map color to index for display
+        idx = colors.index(outcome)
+        # Color the die area to match outcome
+        bg = COLOR_HEX.get(outcome, "#ffffff")
+        fg = "#000000" if outcome == "White" or bg.lower() in ["#facc15"] else "#ffffff"
+        self.die_label.config(text=UNICODE_DICE[idx], bg=bg, fg=fg)
+        self.color_label.config(text=outcome)
+
+    def _update_stats(self):
         self.profit_label.config(text=f"Total Profit: ${self.total_profit:.2f}")
         self.plays_label.config(text=f"Plays: {self.plays}")
 
-        self.roll_btn.config(state="normal")
+    def start_auto_roll(self):
+        # Draw every round up front; no per-roll animation
+        rounds = max(int(self.auto_rounds.get()), 1)
+        mode = self.mode.get()
+        probs = fair_probabilities if mode == "Fair" else tweaked_probabilities
+        bet = float(self.bet_amount.get())
+        outcomes = np.random.choice(len(colors), size=rounds, p=probs)
+        wins = outcomes == colors.index("Red")
+        profits = profits_cents(wins, bet, self._payout_multiplier(mode) - 1)
+
+        self._auto_active = True
+        self._set_buttons("disabled")
+        self._auto_step(mode, bet, outcomes, profits, 0)
+
+    def _auto_step(self, mode, bet, outcomes, profits, start):
+        # Apply one batch of rounds in bulk, then refresh the display once
+        end = min(start + AUTO_ROLL_BATCH, len(outcomes))
+        batch_cents = profits[start:end]
+        totals = from_cents(self.total_cents + np.cumsum(batch_cents, dtype=np.int64))
+        batch = from_cents(batch_cents)
+
+        self.total_cents += int(batch_cents.sum(dtype=np.int64))
+        self.plays += end - start
+        batch_outcomes = [colors[i] for i in outcomes[start:end]]
+        self.history.extend(batch.tolist())
+        self.outcome_history.extend(batch_outcomes)
+        self.roll_log.record_many(self.log_session, mode, None, bet, batch_outcomes, batch)
+        self._history_changed()
+        self.live_chart.extend(totals)
+
+        self._show_outcome(colors[outcomes[end - 1]])
+        self._update_stats()
+
+        if end < len(outcomes):
+            self.after(1000 // AUTO_ROLL_FPS, self._auto_step, mode, bet, outcomes, profits, end)
+        else:
+            self._auto_active = False
+            self._set_buttons("normal")
 
     def reset_game(self):
         if messagebox.askyesno("Reset", "Reset stats and history?"):
-            self.total_profit = 0.0
+            self.total_cents = 0
             self.plays = 0
             self.history.clear()
             self.outcome_history.clear()
-            self.profit_label.config(text=f"Total Profit: ${self.total_profit:.2f}")
-            self.plays_label.config(text=f"Plays: {self.plays}")
+            self.unloaded_plays = 0
+            self._history_changed()
+            self.live_chart.clear()
+            self._update_stats()
+            # Old rolls stay in the log under the previous session id
+            self.log_session = f"desktop-{uuid.uuid4().hex}"
             # reset die color to initial
             initial_bg = COLOR_HEX.get(colors[0], "#ffffff")
             initial_fg = "#000000" if colors[0] == "White" else "#ffffff"
             self.die_label.config(bg=initial_bg, fg=initial_fg, text=UNICODE_DICE[0])
 
+    def _history_changed(self):
+        # Plots rendered from the previous history are stale now
+        self.figure_cache.invalidate(self.history_id)
+        self.history_id += 1
+
+    # Plain Figures rather than pyplot ones: under TkAgg every pyplot figure
+    # gets a manager with a hidden Toplevel in the running app
+    def _build_hist_figure(self):
+        fig = Figure(figsize=(8, 4))
+        ax = fig.add_subplot()
+        ax.hist(self.history, bins=12, alpha=0.7)
+        ax.set_title("Profit Distribution")
+        ax.set_xlabel("Profit per Play")
+        ax.set_ylabel("Frequency")
+        fig.tight_layout()
+        return fig
+
+    def _build_cumulative_figure(self):
+        fig = Figure(figsize=(8, 4))
+        ax = fig.add_subplot()
+        ax.plot(np.cumsum(self.history))
+        ax.set_title("Cumulative Profit Over Plays")
+        ax.set_xlabel("Play Number")
+        ax.set_ylabel("Total Profit")
+        fig.tight_layout()
+        return fig
+
+    def _show_image(self, title, png):
+        win = tk.Toplevel(self)
+        win.title(title)
+        img = tk.PhotoImage(master=win, data=base64.b64encode(png))
+        label = tk.Label(win, image=img)
+        label.image = img  # keep a reference so Tk doesn't drop the image
+        label.pack()
+
     def show_plots(self):
-        if not self.history:
+        if not self.plays:
             messagebox.showinfo("No Data", "No plays yet — roll at least once to see plots.")
             return
-
-        df = pd.DataFrame({
-            "Profit": self.history,
-            "Outcome": self.outcome_history
-        })
-
-        # Profit distribution
-        plt.figure(figsize=(8, 4))
-        plt.hist(df["Profit"], bins=12, alpha=0.7)
-        plt.title("Profit Distribution")
-        plt.xlabel("Profit per Play")
-        plt.ylabel("Frequency")
-        plt.tight_layout()
-        plt.show()
-
-        # Cumulative profit
-        plt.figure(figsize=(8, 4))
-        plt.plot(pd.Series(self.history).cumsum())
-        plt.title("Cumulative Profit Over Plays")
-        plt.xlabel("Play Number")
-        plt.ylabel("Total Profit")
-        plt.tight_layout()
-        plt.show()
-
+        if self.unloaded_plays:
+            # The log holds the restored plays and every one since
+            self.outcome_history, profits = self.roll_log.rolls(self.log_session)
+            self.history = profits.tolist()
+            self.unloaded_plays = 0
+
+        # Repeat views of the same history reuse the cached PNG bytes
+        hist_png = self.figure_cache.render((self.history_id, "hist", "default"), self._build_hist_figure)
+        cum_png = self.figure_cache.render((self.history_id, "cumulative", "default"), self._build_cumulative_figure)
+        self._show_image("Profit Distribution", hist_png)
+        self._show_image("Cumulative Profit Over Plays", cum_png)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Color Dice Game — GUI or Monte Carlo simulation")
@@ -181,15 +421,13 @@ if __name__ == "__main__":
     parser.add_argument("--plays", type=int, default=20000, help="Number of plays per simulation (default: 20000)")
     parser.add_argument("--bet", type=float, default=1.0, help="Bet amount per play (default: 1.0)")
     parser.add_argument("--tweak", choices=["payout", "prob"], default="payout", help="Which tweak to apply for the tweaked model")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible runs; seeded runs are cached in the result store")
+    parser.add_argument("--ruin", type=float, default=None, help="Loss that counts as going broke for time-to-ruin (default: 100 bets)")
     args = parser.parse_args()
+    if args.plays < 1:
+        parser.error("--plays must be at least 1")
 
-    def simulate_once(probs, payout_net, chosen_idx, plays, bet):
-        outcomes = np.random.choice(len(probs), size=plays, p=probs)
-        wins = outcomes == chosen_idx
-        profits = np.where(wins, payout_net * bet, -bet)
-        return profits
-
-    def run_simulation(mode, plays=20000, bet=1.0, tweak_type="payout"):
+    def run_simulation(mode, plays=20000, bet=1.0, tweak_type="payout", ruin_level=None, seed=None):
         chosen_color = "Red"
         chosen_idx = colors.index(chosen_color)
         p_fair = np.array([1/6.0] * 6)
@@ -208,20 +446,27 @@ if __name__ == "__main__":
         else:
             raise ValueError("Unknown mode")
 
-        profits = simulate_once(probs, payout_net, chosen_idx, plays, bet)
-        total = profits.sum()
-        mean = profits.mean()
-        std = profits.std()
-        win_rate = (profits > 0).mean()
-        house_edge = -mean / bet
+        if ruin_level is None:
+            ruin_level = 100 * bet
 
         out_dir = os.path.join(os.path.dirname(__file__), "sim_outputs")
         os.makedirs(out_dir, exist_ok=True)
 
-        # Save histogram
+        # Per-play CSV, written chunk by chunk: the full path is never held in memory.
+        # Seeded runs are shared with the Streamlit app through the result store;
+        # unseeded runs get a fresh seed that is reported so they can be reproduced
+        csv_path = os.path.join(out_dir, f"results_{mode}_{tweak_type}_{plays}.csv")
+        with open(csv_path, "w", newline="") as csv_file:
+            def write_csv(start, chunk):
+                pd.DataFrame({"profit": from_cents(chunk)}).to_csv(csv_file, header=start == 0, index=False)
+
+            stats, seed, cached = simulate_run(probs, payout_net, bet, plays, ruin_level, seed=seed,
+                                               store=ResultStore(), on_chunk=write_csv)
+
+        # Save histogram (weighted by the exact per-profit counts)
         hist_path = os.path.join(out_dir, f"hist_{mode}_{tweak_type}_{plays}.png")
         plt.figure(figsize=(8, 4))
-        plt.hist(profits, bins=40, alpha=0.7)
+        plt.hist(stats["path"]["values"], bins=40, weights=stats["path"]["counts"], alpha=0.7)
         plt.title(f"Profit Distribution — {mode} ({tweak_type})")
         plt.xlabel("Profit per Play")
         plt.ylabel("Frequency")
@@ -229,10 +474,10 @@ if __name__ == "__main__":
         plt.savefig(hist_path)
         plt.close()
 
-        # Cumulative profit
+        # Cumulative profit (every play up to PATH_POINTS plays, evenly spaced plays beyond)
         cum_path = os.path.join(out_dir, f"cumulative_{mode}_{tweak_type}_{plays}.png")
         plt.figure(figsize=(8, 4))
-        plt.plot(np.cumsum(profits))
+        plt.plot(stats["path"]["x"], stats["path"]["y"])
         plt.title(f"Cumulative Profit — {mode} ({tweak_type})")
         plt.xlabel("Play Number")
         plt.ylabel("Total Profit")
@@ -240,41 +485,65 @@ if __name__ == "__main__":
         plt.savefig(cum_path)
         plt.close()
 
-        # Save CSV summary
-        df = pd.DataFrame({"profit": profits})
-        csv_path = os.path.join(out_dir, f"results_{mode}_{tweak_type}_{plays}.csv")
-        df.to_csv(csv_path, index=False)
+        # Running house edge with its confidence band (log-spaced plays)
+        conv = stats["convergence"]
+        conv_plays = np.array(conv["plays"])
+        edge = -np.array(conv["mean"]) / bet * 100
+        band = np.array(conv["half_width"]) / bet * 100
+        conv_path = os.path.join(out_dir, f"convergence_{mode}_{tweak_type}_{plays}.png")
+        plt.figure(figsize=(8, 4))
+        plt.fill_between(conv_plays, edge - band, edge + band, alpha=0.3, label=f"Confidence band (±{conv['z']:g} SE)")
+        plt.plot(conv_plays, edge, label="Running house edge")
+        plt.axhline((1 - probs[chosen_idx] * (1 + payout_net)) * 100, color="gray", linestyle="--", label="Exact house edge")
+        plt.xscale("log")
+        plt.title(f"House Edge Convergence — {mode} ({tweak_type})")
+        plt.xlabel("Plays")
+        plt.ylabel("House Edge (%)")
+        plt.legend()
+        plt.tight_layout()
+        plt.savefig(conv_path)
+        plt.close()
 
         return {
             "mode": mode,
             "tweak": tweak_type,
-            "plays": plays,
-            "bet": bet,
-            "total": float(total),
-            "mean": float(mean),
-            "std": float(std),
-            "win_rate": float(win_rate),
-            "house_edge": float(house_edge),
+            **stats,
+            "seed": seed,
+            "cached": cached,
             "hist": hist_path,
             "cumulative": cum_path,
+            "convergence_chart": conv_path,
             "csv": csv_path,
         }
 
     if args.simulate:
         print(f"Running simulations: {args.plays} plays per model, bet={args.bet}, tweak={args.tweak}")
-        fair_stats = run_simulation("fair", plays=args.plays, bet=args.bet, tweak_type=args.tweak)
-        tweaked_stats = run_simulation("tweaked", plays=args.plays, bet=args.bet, tweak_type=args.tweak)
+        fair_stats = run_simulation("fair", plays=args.plays, bet=args.bet, tweak_type=args.tweak, ruin_level=args.ruin, seed=args.seed)
+        tweaked_stats = run_simulation("tweaked", plays=args.plays, bet=args.bet, tweak_type=args.tweak, ruin_level=args.ruin, seed=args.seed)
 
         def print_stats(s):
             print("---")
             print(f"Mode: {s['mode']} (tweak={s['tweak']})")
-            print(f"Plays: {s['plays']}")
+            print(f"Plays: {s['plays']}" + (" (from result store)" if s["cached"] else ""))
+            print(f"Seed: {s['seed']}")
             print(f"Total player profit: ${s['total']:.2f}")
             print(f"Mean profit per play: ${s['mean']:.4f}")
             print(f"Stddev: ${s['std']:.4f}")
             print(f"Win rate: {s['win_rate']*100:.2f}%")
-            print(f"Estimated house edge: {s['house_edge']*100:.4f}%")
-            print(f"Outputs: {s['hist']}, {s['cumulative']}, {s['csv']}")
+            conv = s["convergence"]
+            print(f"Estimated house edge: {s['house_edge']*100:.4f}% ± {conv['half_width'][-1] / s['bet'] * 100:.4f}% ({conv['z']:g} SE)")
+            risk = s["risk"]
+            print(f"Max drawdown: ${risk['max_drawdown']:.2f}")
+            print(f"Longest losing streak: {risk['longest_losing_streak']} plays")
+            if risk["ruin_play"] is not None:
+                print(f"Down ${risk['ruin_level']:.2f} after: {risk['ruin_play']} plays")
+            else:
+                print(f"Down ${risk['ruin_level']:.2f} after: never")
+            quantiles = ", ".join(f"P{q*100:.0f} ${v:.2f}" for q, v in risk["block_quantiles"].items() if v is not None)
+            print(f"Profit per {risk['block_size']} plays: {quantiles or 'n/a'}")
+            for cp, value in risk["checkpoints"].items():
+                print(f"  after {cp} plays: ${value:.2f}")
+            print(f"Outputs: {s['hist']}, {s['cumulative']}, {s['convergence_chart']}, {s['csv']}")
 
         print_stats(fair_stats)
         print_stats(tweaked_stats)
@@ -0,0 +1,82 @@
+import math
+
+import numpy as np
+
+# Integer-cents accounting
+# - Bets and payouts are converted once to whole cents (minor units)
+# - Per-play profits are int32 cents when they fit (half the memory traffic
+#   of float64); consumers accumulate them into int64 (cumsum/sum dtype)
+#   rather than widening a copy first
+# - The ledger's totals come from win/loss counts and are kept as Python
+#   ints, so they are exact and the same however the plays are chunked or
+#   merged
+# - Winnings that are not a whole number of cents (e.g. 4.9 x $0.15) are
+#   rounded down; the house keeps the fraction
+
+CENTS = 100
+
+
+def to_cents(amount):
+    """Dollar amount to whole cents"""
+    return int(round(amount * CENTS))
+
+
+def from_cents(cents):
+    """Cents (int or array) to dollars"""
+    return cents / CENTS
+
+
+def win_cents(bet, payout_net):
+    """Net winnings of a winning bet in cents"""
+    # Round away float noise first so 4.9 * 100 doesn't floor to 489
+    return int(math.floor(round(bet * payout_net * CENTS, 6)))
+
+
+def profits_cents(wins, bet, payout_net):
+    """Per-play profit in cents for an array of win flags"""
+    bet_c, win_c = to_cents(bet), win_cents(bet, payout_net)
+    dtype = np.int32 if max(bet_c, win_c) <= np.iinfo(np.int32).max else np.int64
+    return np.where(wins, dtype(win_c), dtype(-bet_c))
+
+
+class Ledger:
+    """Exact running totals of fixed-bet plays in cents; mergeable"""
+
+    def __init__(self):
+        self.plays = 0
+        self.wins = 0
+        self.total_cents = 0
+        self.sum_sq = 0  # cents^2, for the standard deviation
+
+    def add(self, wins, win_c, bet_c):
+        """Add a chunk of plays from their win flags; a win pays win_c cents, a loss costs bet_c"""
+        won = int(np.count_nonzero(wins))
+        lost = np.size(wins) - won
+        self.plays += won + lost
+        self.wins += won
+        self.total_cents += won * win_c - lost * bet_c
+        self.sum_sq += won * win_c ** 2 + lost * bet_c ** 2
+
+    def merge(self, other):
+        self.plays += other.plays
+        self.wins += other.wins
+        self.total_cents += other.total_cents
+        self.sum_sq += other.sum_sq
+
+    @property
+    def total(self):
+        return from_cents(self.total_cents)
+
+    def summary(self, bet):
+        """plays/bet/total/mean/std/win_rate/house_edge in dollars, like the simulation stats"""
+        mean = self.total / self.plays
+        variance = max(self.sum_sq / self.plays / CENTS ** 2 - mean ** 2, 0.0)
+        return {
+            "plays": self.plays,
+            "bet": bet,
+            "total": self.total,
+            "mean": mean,
+            "std": math.sqrt(variance),
+            "win_rate": self.wins / self.plays,
+            "house_edge": -mean / bet,
+        }
@@ -0,0 +1,185 @@
+import argparse
+import json
+
+import numpy as np
+
+from game_config import colors, fair_probabilities
+
+# Difficulty table calibration
+# - A difficulty level rigs a bet on Red with two levers: a lower chance of
+#   Red (visible bias) and a lower net payout than the fair 5:1
+# - House edge of a level: 1 - p * (1 + payout), with payout the net payout
+#   (game_config's payout_multiplier: a win nets payout x bet)
+# - Each target edge is met by pulling both levers the same fraction t of
+#   their allowed range (max_bias below 1/6, payout down to min_payout);
+#   t is found by vectorized bisection for all targets at once
+# - The payout is then rounded to a readable step and p re-solved exactly,
+#   and every candidate is checked analytically and by Monte Carlo
+#
+# The output is a dict in the same format as game_config.DIFFICULTY_LEVELS.
+
+CHOSEN_IDX = colors.index("Red")
+FAIR_P = fair_probabilities[CHOSEN_IDX]
+FAIR_PAYOUT = (1 - FAIR_P) / FAIR_P
+
+DEFAULT_PAYOUT_STEP = 0.1  # payouts are shown with one decimal, like 4.9x
+DEFAULT_MC_PLAYS = 10_000_000
+
+
+def house_edge(p, payout_net):
+    """House edge per unit bet of a bet on Red"""
+    return 1 - p * (1 + payout_net)
+
+
+def _bisect(f, lo, hi, iters=60):
+    """Vectorized bisection for increasing f with f(lo) <= 0 <= f(hi)"""
+    lo = np.array(lo, dtype=np.float64)
+    hi = np.array(hi, dtype=np.float64)
+    for _ in range(iters):
+        mid = (lo + hi) / 2
+        below = f(mid) < 0
+        lo = np.where(below, mid, lo)
+        hi = np.where(below, hi, mid)
+    return (lo + hi) / 2
+
+
+def _levers(t, max_bias, min_payout):
+    """Red probability and payout after pulling both levers a fraction t"""
+    return FAIR_P - t * max_bias, FAIR_PAYOUT - t * (FAIR_PAYOUT - min_payout)
+
+
+def solve(edges, max_bias=0.05, min_payout=3.0, payout_step=DEFAULT_PAYOUT_STEP):
+    """Probability/payout pairs that hit each target house edge.
+
+    Returns arrays (p, payout, feasible). A target is infeasible when even
+    the full allowed bias and the minimum payout cannot reach it.
+    """
+    edges = np.asarray(edges, dtype=np.float64)
+    if not 0 <= max_bias < FAIR_P or not 0 <= min_payout <= FAIR_PAYOUT:
+        raise ValueError(f"Need 0 <= max_bias < {FAIR_P:.4f} and 0 <= min_payout <= {FAIR_PAYOUT:g}")
+
+    # Edge grows monotonically with t from 0 (fair) to its maximum at t = 1
+    def gap(t):
+        return house_edge(*_levers(t, max_bias, min_payout)) - edges
+
+    max_edge = house_edge(*_levers(1.0, max_bias, min_payout))
+    t = _bisect(gap, np.zeros_like(edges), np.ones_like(edges))
+    _, payout = _levers(t, max_bias, min_payout)
+
+    # Round the payout to the display step (never below the minimum), then
+    # move the whole remaining edge into the probability. The nearest step
+    # is preferred; the other neighbour is used if the nearest one would
+    # push p outside its allowed range.
+    def on_grid(rounder):
+        grid = np.round(np.maximum(rounder(payout / payout_step) * payout_step, min_payout), 10)
+        p = (1 - edges) / (1 + grid)
+        return grid, p, (p >= FAIR_P - max_bias - 1e-12) & (p <= FAIR_P + 1e-12)
+
+    near_payout, near_p, near_ok = on_grid(np.round)
+    lo_payout, lo_p, lo_ok = on_grid(np.floor)
+    hi_payout, hi_p, hi_ok = on_grid(np.ceil)
+    alt_payout = np.where(lo_ok, lo_payout, hi_payout)
+    alt_p = np.where(lo_ok, lo_p, hi_p)
+    payout = np.where(near_ok, near_payout, alt_payout)
+    p = np.where(near_ok, near_p, alt_p)
+    feasible = (edges >= 0) & (edges <= max_edge) & (near_ok | lo_ok | hi_ok)
+    return p, payout, feasible
+
+
+def face_probabilities(p, decimals=6):
+    """Six face probabilities with Red at p and the rest shared evenly, summing to 1"""
+    p = round(float(p), decimals)
+    others = [round((1 - p) / 5, decimals)] * 5
+    others[-1] = round(1 - p - sum(others[:-1]), decimals)
+    return [p] + others
+
+
+def validate(p, payout, edges, plays=DEFAULT_MC_PLAYS, rng=None):
+    """Analytic edge and a Monte Carlo estimate (with standard error) per candidate"""
+    rng = np.random.default_rng() if rng is None else rng
+    analytic = house_edge(p, payout)
+    # The number of wins in `plays` independent bets is binomial, so one
+    # draw per candidate simulates the whole run
+    wins = rng.binomial(plays, p)
+    mc = 1 - wins * (1 + payout) / plays
+    se = (1 + payout) * np.sqrt(p * (1 - p) / plays)
+    return {
+        "analytic_edge": analytic,
+        "mc_edge": mc,
+        "mc_se": se,
+        # Rounding the probabilities to 6 decimals moves the edge by < 1e-5
+        "ok": (np.abs(analytic - edges) < 1e-5) & (np.abs(mc - edges) <= 4 * se),
+    }
+
+
+def calibrate(edges, names=None, max_bias=0.05, min_payout=3.0, payout_step=DEFAULT_PAYOUT_STEP,
+              plays=DEFAULT_MC_PLAYS, rng=None):
+    """Solve and validate many target edges; returns (difficulty table, report rows)"""
+    edges = np.asarray(edges, dtype=np.float64)
+    names = names or [f"House Edge {e*100:g}%" for e in edges]
+    if len(names) != len(edges):
+        raise ValueError("Need one name per target edge")
+
+    p, payout, feasible = solve(edges, max_bias, min_payout, payout_step)
+    rounded_p = np.array([face_probabilities(x)[0] for x in p])
+    checks = validate(rounded_p, payout, edges, plays, rng)
+
+    table = {}
+    report = []
+    for i, name in enumerate(names):
+        row = {
+            "name": name,
+            "target_edge": float(edges[i]),
+            "feasible": bool(feasible[i]),
+            "red_probability": float(rounded_p[i]),
+            "payout_multiplier": float(payout[i]),
+            "analytic_edge": float(checks["analytic_edge"][i]),
+            "mc_edge": float(checks["mc_edge"][i]),
+            "mc_se": float(checks["mc_se"][i]),
+            "ok": bool(checks["ok"][i]),
+        }
+        report.append(row)
+        if feasible[i] and checks["ok"][i]:
+            table[name] = {
+                "probabilities": face_probabilities(p[i]),
+                "payout_multiplier": float(payout[i]),
+                "description": f"House edge {edges[i]*100:g}%",
+            }
+    return table, report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a difficulty table from target house edges")
+    parser.add_argument("--edges", type=float, nargs="+", default=[0.05, 0.10, 0.20, 0.35],
+                        help="Target house edges as fractions (default: 0.05 0.10 0.20 0.35)")
+    parser.add_argument("--names", type=str, nargs="+", default=None, help="Level names, one per edge")
+    parser.add_argument("--max-bias", type=float, default=0.05, help="Max drop of Red's probability below 1/6 (default: 0.05)")
+    parser.add_argument("--min-payout", type=float, default=3.0, help="Lowest net payout allowed (default: 3.0)")
+    parser.add_argument("--payout-step", type=float, default=DEFAULT_PAYOUT_STEP, help="Payout rounding step (default: 0.1)")
+    parser.add_argument("--plays", type=int, default=DEFAULT_MC_PLAYS, help="Monte Carlo plays per level (default: 10,000,000)")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for the Monte Carlo check")
+    parser.add_argument("--json", type=str, default=None, help="Also write the table to this JSON file")
+    args = parser.parse_args()
+
+    table, report = calibrate(args.edges, args.names, args.max_bias, args.min_payout, args.payout_step,
+                              args.plays, np.random.default_rng(args.seed))
+
+    print(f"{'level':<22}{'target':>9}{'P(Red)':>9}{'payout':>8}{'exact':>9}{'MC':>9}  check")
+    for r in report:
+        if not r["feasible"]:
+            print(f"{r['name']:<22}{r['target_edge']*100:>8.2f}%  infeasible with these constraints")
+            continue
+        print(f"{r['name']:<22}{r['target_edge']*100:>8.2f}%{r['red_probability']:>9.4f}{r['payout_multiplier']:>8.1f}"
+              f"{r['analytic_edge']*100:>8.2f}%{r['mc_edge']*100:>8.2f}%  {'ok' if r['ok'] else 'FAILED'}")
+    print()
+    print("DIFFICULTY_LEVELS = {")
+    for name, level in table.items():
+        print(f"    {json.dumps(name)}: {{")
+        print(f'        "probabilities": {json.dumps(level["probabilities"])},')
+        print(f'        "payout_multiplier": {level["payout_multiplier"]},')
+        print(f'        "description": {json.dumps(level["description"])}')
+        print("    },")
+    print("}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(table, f, indent=2)
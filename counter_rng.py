@@ -0,0 +1,90 @@
+import argparse
+import time
+
+import numpy as np
+
+from game_config import colors, fair_probabilities, DIFFICULTY_LEVELS
+from result_store import unpack_wins
+
+# Counter-based random numbers for seeded simulations
+# - Every play of a run draws exactly one uniform from a Philox generator
+#   keyed by the run's seed, so play i always uses the i-th 64-bit output
+# - Philox produces four 64-bit outputs per counter step and can advance
+#   its counter directly, so plays [start, start + count) are regenerated
+#   in O(count) without touching the plays before them
+# - The outcome of a play is the inverse CDF of its uniform over the face
+#   probabilities
+#
+# This makes any window of a run reproducible on its own: shards of a long
+# run can be computed independently, and stored results can be verified by
+# spot-checking a few windows instead of rerunning everything.
+
+OUTPUTS_PER_STEP = 4  # 64-bit outputs per Philox counter increment
+
+
+def new_seed():
+    """Fresh 128-bit seed for runs where the caller did not pick one"""
+    return int(np.random.SeedSequence().entropy)
+
+
+def generator_at(seed, start=0):
+    """Generator whose next uniform is the one used by play start of the seeded run"""
+    key = np.random.SeedSequence(seed).generate_state(2, np.uint64)
+    bit_generator = np.random.Philox(key=key).advance(start // OUTPUTS_PER_STEP)
+    gen = np.random.Generator(bit_generator)
+    if start % OUTPUTS_PER_STEP:
+        gen.random(start % OUTPUTS_PER_STEP)
+    return gen
+
+
+def outcomes_from_uniforms(u, probs):
+    """Face index of each uniform by inverse CDF"""
+    cdf = np.cumsum(probs)
+    return np.minimum(np.searchsorted(cdf, u, side="right"), len(cdf) - 1)
+
+
+def play_outcomes(probs, seed, start, count, gen=None):
+    """Outcomes of plays [start, start + count) of the run with this seed.
+
+    Pass the generator returned by a previous call's generator_at (already
+    positioned at start) to read consecutive chunks without re-advancing.
+    """
+    gen = generator_at(seed, start) if gen is None else gen
+    return outcomes_from_uniforms(gen.random(count), probs)
+
+
+def spot_check(packed_wins, plays, probs, chosen_idx, seed, windows=8, window=1000, rng=None):
+    """Regenerate a few random windows of a stored run and compare its win flags.
+
+    packed_wins are the run's np.packbits win flags (e.g. a result store
+    mmap); only the checked windows are unpacked.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    window = min(window, plays)
+    for start in rng.integers(0, plays - window + 1, size=windows):
+        start = int(start)
+        expected = play_outcomes(probs, seed, start, window) == chosen_idx
+        if not np.array_equal(unpack_wins(packed_wins, start, window), expected):
+            return False
+    return True
+
+
+if __name__ == "__main__":
+    profiles = ["Fair"] + list(DIFFICULTY_LEVELS)
+    parser = argparse.ArgumentParser(description="Regenerate any window of a seeded simulation run")
+    parser.add_argument("--seed", type=int, required=True, help="Seed of the run")
+    parser.add_argument("--start", type=int, default=0, help="First play of the window (0-based)")
+    parser.add_argument("--count", type=int, default=1000, help="Plays in the window (default: 1000)")
+    parser.add_argument("--difficulty", choices=profiles, default="Fair", help="Face probabilities of the run (default: Fair)")
+    parser.add_argument("--show", type=int, default=10, help="Outcomes to print from the start of the window (default: 10)")
+    args = parser.parse_args()
+
+    probs = fair_probabilities if args.difficulty == "Fair" else DIFFICULTY_LEVELS[args.difficulty]["probabilities"]
+    t0 = time.perf_counter()
+    outcomes = play_outcomes(probs, args.seed, args.start, args.count)
+    elapsed = (time.perf_counter() - t0) * 1000
+
+    counts = np.bincount(outcomes, minlength=len(colors))
+    print(f"Plays {args.start:,}-{args.start + args.count - 1:,} of seed {args.seed} ({args.difficulty}), regenerated in {elapsed:.2f} ms")
+    print("First outcomes: " + ", ".join(colors[i] for i in outcomes[:args.show]))
+    print("Counts: " + ", ".join(f"{c} {n}" for c, n in zip(colors, counts)))
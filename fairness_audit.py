@@ -0,0 +1,236 @@
+import argparse
+import math
+import sys
+
+import numpy as np
+
+from game_config import colors, fair_probabilities, DIFFICULTY_LEVELS
+
+# Streaming fairness auditor
+# - Reads a stream of observed outcomes (color names or 0-5 indices) in chunks
+# - Keeps running color counts for chi-square and G-test goodness of fit
+#   against the fair die
+# - Runs one CUSUM test per rigged profile: fair vs DIFFICULTY_LEVELS[...],
+#   each outcome adds log(p_rigged / p_fair) to that profile's log-likelihood
+#   ratio, which restarts from 0 whenever it would go negative
+#   (llr = max(0, llr + inc)), so a fair prefix never rules a profile out for
+#   the rest of the stream
+# - Flags the stream as rigged the moment any ratio crosses its threshold,
+#   without keeping more than one chunk in memory
+#
+# The chi-square/G statistics are fixed-sample tests; checking them over and
+# over while data streams in inflates their false-alarm rate. The CUSUM is the
+# one meant to be watched continuously: its thresholds are set so a fair
+# stream raises a false alarm about once every `arl` outcomes.
+
+CHUNK_OUTCOMES = 1 << 18  # outcomes scored per vectorized step
+READ_BYTES = 1 << 22  # bytes read from the input per block
+
+
+def cusum_threshold(arl, drift):
+    """Alarm threshold h giving a fair-stream average run length of about arl.
+
+    Uses Siegmund's approximation ARL ~ (e^h - h - 1) / drift for a CUSUM of
+    log-likelihood ratios, where drift = KL(fair || rigged) per outcome.
+    """
+    target = arl * drift
+    h = math.log(target + 1)
+    for _ in range(50):
+        h = math.log(target + h + 1)
+    return h
+
+
+def chi2_sf(x, df):
+    """Chi-square survival function P(X >= x) for integer df (closed form)"""
+    if x <= 0:
+        return 1.0
+    half = x / 2.0
+    if df % 2 == 0:
+        term = total = math.exp(-half)
+        for k in range(1, df // 2):
+            term *= half / k
+            total += term
+        return min(total, 1.0)
+    total = math.erfc(math.sqrt(half))
+    term = math.sqrt(2.0 * x / math.pi) * math.exp(-half)
+    for k in range(1, (df + 1) // 2):
+        total += term
+        term *= x / (2 * k + 1)
+    return min(total, 1.0)
+
+
+class FairnessAuditor:
+    def __init__(self, expected=fair_probabilities, alternatives=None, arl=1e9):
+        """expected: null-hypothesis face probabilities.
+        alternatives: {name: probabilities} rigged profiles for the CUSUM tests
+        (default: every DIFFICULTY_LEVELS entry).
+        arl: mean number of fair outcomes between false alarms.
+        """
+        if alternatives is None:
+            alternatives = {name: cfg["probabilities"] for name, cfg in DIFFICULTY_LEVELS.items()}
+        self.expected = np.asarray(expected, dtype=np.float64)
+        self.names = list(alternatives)
+        alt = np.array([alternatives[name] for name in self.names], dtype=np.float64)
+        # Per-face log-likelihood ratio increment, one row per profile
+        self.log_ratio = np.log(alt) - np.log(self.expected)
+
+        drift = -(self.expected * self.log_ratio).sum(axis=1)
+        self.upper = np.array([cusum_threshold(arl, d) for d in drift])
+
+        self.n = 0
+        self.counts = np.zeros(self.expected.size, dtype=np.int64)
+        self.llr = np.zeros(len(self.names))
+        self.decisions = [None] * len(self.names)  # "rigged" once a test alarms
+        self.decided_at = [None] * len(self.names)
+        self.flagged = None  # (profile name, outcome number) of the first rigged decision
+
+    def update(self, outcomes):
+        """Score the next chunk of outcome indices"""
+        outcomes = np.asarray(outcomes, dtype=np.intp)
+        for start in range(0, outcomes.size, CHUNK_OUTCOMES):
+            self._update_chunk(outcomes[start:start + CHUNK_OUTCOMES])
+
+    def _update_chunk(self, chunk):
+        if chunk.size == 0:
+            return
+        self.counts += np.bincount(chunk, minlength=self.expected.size)
+
+        open_tests = [i for i, d in enumerate(self.decisions) if d is None]
+        if open_tests:
+            # max(0, llr + inc) unrolled: with C the running sum from the
+            # current llr, the CUSUM is C minus its running minimum below 0
+            sums = self.llr[open_tests, None] + np.cumsum(self.log_ratio[open_tests][:, chunk], axis=1)
+            paths = sums - np.minimum(np.minimum.accumulate(sums, axis=1), 0)
+            for test, path in zip(open_tests, paths):
+                crossed = np.flatnonzero(path >= self.upper[test])
+                if crossed.size:
+                    at = crossed[0]
+                    self.llr[test] = path[at]
+                    self.decisions[test] = "rigged"
+                    self.decided_at[test] = self.n + int(at) + 1
+                    if self.flagged is None or self.decided_at[test] < self.flagged[1]:
+                        self.flagged = (self.names[test], self.decided_at[test])
+                else:
+                    self.llr[test] = path[-1]
+
+        self.n += chunk.size
+
+    def chi_square(self):
+        """Pearson chi-square statistic and p-value against the expected probabilities"""
+        if self.n == 0:
+            return 0.0, 1.0  # no outcomes, no evidence
+        expected = self.expected * self.n
+        stat = float(((self.counts - expected) ** 2 / expected).sum())
+        return stat, chi2_sf(stat, self.expected.size - 1)
+
+    def g_test(self):
+        """G (log-likelihood ratio) statistic and p-value"""
+        observed = self.counts[self.counts > 0]
+        expected = (self.expected * self.n)[self.counts > 0]
+        stat = float(2 * (observed * np.log(observed / expected)).sum())
+        return stat, chi2_sf(stat, self.expected.size - 1)
+
+    def report(self):
+        chi2, chi2_p = self.chi_square()
+        g, g_p = self.g_test()
+        return {
+            "outcomes": self.n,
+            "frequencies": (self.counts / max(self.n, 1)).tolist(),
+            "chi_square": chi2,
+            "chi_square_p": chi2_p,
+            "g": g,
+            "g_p": g_p,
+            "cusum": {
+                name: {
+                    "llr": float(self.llr[i]),
+                    "threshold": float(self.upper[i]),
+                    "decision": self.decisions[i],
+                    "at": self.decided_at[i],
+                }
+                for i, name in enumerate(self.names)
+            },
+            "flagged": self.flagged,
+        }
+
+
+def _token_codes(tokens):
+    """Map outcome tokens (color names, any case, or 0-5 indices) to indices"""
+    lookup = {c.lower().encode(): i for i, c in enumerate(colors)}
+    lookup.update({str(i).encode(): i for i in range(len(colors))})
+    uniq, inverse = np.unique(np.array(tokens), return_inverse=True)
+    try:
+        codes = np.array([lookup[u.lower()] for u in uniq], dtype=np.intp)
+    except KeyError as e:
+        raise ValueError(f"Unknown outcome {e.args[0].decode()!r}") from None
+    return codes[inverse]
+
+
+def read_outcomes(stream):
+    """Yield arrays of outcome indices from a binary stream of whitespace-separated tokens"""
+    tail = b""
+    while True:
+        block = stream.read(READ_BYTES)
+        if not block:
+            break
+        tokens = (tail + block).split()
+        # The last token may continue in the next block
+        if not block[-1:].isspace() and tokens:
+            tail = tokens.pop()
+        else:
+            tail = b""
+        if tokens:
+            yield _token_codes(tokens)
+    if tail:
+        yield _token_codes([tail])
+
+
+def simulated_outcomes(probs, total, seed=None):
+    """Yield chunks of outcomes drawn from probs, for trying the auditor out"""
+    rng = np.random.default_rng(seed)
+    for start in range(0, total, CHUNK_OUTCOMES):
+        yield rng.choice(len(probs), size=min(CHUNK_OUTCOMES, total - start), p=probs)
+
+
+if __name__ == "__main__":
+    profiles = ["Fair"] + list(DIFFICULTY_LEVELS)
+    parser = argparse.ArgumentParser(description="Streaming fairness audit of an outcome log")
+    parser.add_argument("path", nargs="?", default="-", help="File of outcomes (color names or 0-5), '-' for stdin")
+    parser.add_argument("--simulate", choices=profiles, default=None, help="Audit a simulated stream from this profile instead")
+    parser.add_argument("--n", type=int, default=1_000_000, help="Outcomes to simulate (default: 1,000,000)")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for --simulate")
+    parser.add_argument("--alpha", type=float, default=0.01, help="Chi-square/G-test significance level (default: 0.01)")
+    parser.add_argument("--arl", type=float, default=1e9, help="Fair outcomes between CUSUM false alarms (default: 1e9)")
+    parser.add_argument("--full", action="store_true", help="Keep reading after the stream is flagged")
+    args = parser.parse_args()
+
+    auditor = FairnessAuditor(arl=args.arl)
+
+    def audit(chunks):
+        for chunk in chunks:
+            auditor.update(chunk)
+            if auditor.flagged and not args.full:
+                break
+
+    if args.simulate:
+        probs = fair_probabilities if args.simulate == "Fair" else DIFFICULTY_LEVELS[args.simulate]["probabilities"]
+        audit(simulated_outcomes(probs, args.n, args.seed))
+    elif args.path == "-":
+        audit(read_outcomes(sys.stdin.buffer))
+    else:
+        with open(args.path, "rb") as f:
+            audit(read_outcomes(f))
+
+    r = auditor.report()
+    print(f"Outcomes read: {r['outcomes']:,}")
+    print("Frequencies: " + ", ".join(f"{c} {f*100:.2f}%" for c, f in zip(colors, r["frequencies"])))
+    print(f"Chi-square: {r['chi_square']:.2f} (p = {r['chi_square_p']:.3g})")
+    print(f"G-test:     {r['g']:.2f} (p = {r['g_p']:.3g})")
+    for name, t in r["cusum"].items():
+        status = f"{t['decision']} after {t['at']:,} outcomes" if t["decision"] else "no alarm"
+        print(f"CUSUM vs {name}: LLR {t['llr']:.2f} / {t['threshold']:.2f} — {status}")
+    if r["flagged"]:
+        print(f"RIGGED: looks like '{r['flagged'][0]}' (flagged after {r['flagged'][1]:,} outcomes)")
+    elif min(r["chi_square_p"], r["g_p"]) < args.alpha:
+        print("NOT FAIR: the outcomes reject the fair die, but match none of the difficulty profiles.")
+    else:
+        print("No evidence of rigging against the difficulty profiles.")
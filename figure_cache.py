@@ -0,0 +1,84 @@
+import io
+import threading
+from collections import OrderedDict
+
+import matplotlib.pyplot as plt
+
+# Rendered-figure byte cache
+# - Shared by the Streamlit app and the Tkinter GUI
+# - Keys are (simulation id, chart type, theme) tuples
+# - Stores the encoded PNG/SVG bytes, evicting least recently used entries
+#   once the total size goes over the byte budget
+
+
+class FigureCache:
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size(self):
+        """Total number of cached bytes"""
+        return self._size
+
+    def get(self, key):
+        """Return cached bytes for key (marking it recently used) or None"""
+        with self._lock:
+            data = self._entries.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key, data):
+        """Store bytes under key and evict old entries past the size limit"""
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            # A single figure bigger than the whole budget is never kept
+            if len(data) > self.max_bytes:
+                return
+            self._entries[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def render(self, key, build_fig, fmt="png", dpi=100):
+        """Return the bytes for key, calling build_fig() to draw it on a miss.
+
+        build_fig must return a matplotlib Figure; it is encoded with
+        savefig and closed, so only the bytes are kept around.
+        """
+        data = self.get(key)
+        if data is not None:
+            return data
+
+        fig = build_fig()
+        buf = io.BytesIO()
+        fig.savefig(buf, format=fmt, dpi=dpi, bbox_inches="tight", facecolor=fig.get_facecolor())
+        plt.close(fig)
+        data = buf.getvalue()
+        self.put(key, data)
+        return data
+
+    def invalidate(self, sim_id):
+        """Drop every chart rendered from the given simulation id"""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == sim_id]:
+                self._size -= len(self._entries.pop(key))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
@@ -0,0 +1,315 @@
+import argparse
+import math
+import time
+
+import numpy as np
+
+from accounting import from_cents, to_cents, win_cents
+from game_config import colors, fair_probabilities, DIFFICULTY_LEVELS
+
+# Exact gambler's-ruin calculator
+# - The bankroll is an absorbing Markov chain: every play is a fixed bet on
+#   Red that wins payout_net * bet with probability p and loses bet otherwise
+# - The session ends when the bankroll can no longer cover a bet (ruin) or
+#   reaches the target (e.g. doubling up)
+# - Amounts are put on an integer lattice (gcd of bet, win and bankroll in
+#   cents, with winnings rounded down to the cent like accounting.win_cents),
+#   so payouts like 4.9x stay exact
+# - I - Q is banded; grouping states into blocks as wide as the largest
+#   step makes it block-tridiagonal, and every block row away from the two
+#   ends is the same. A uniform run of L block rows is eliminated by doubling
+#   (two runs of L joined through one block row make a run of 2L + 1), so the
+#   solve takes O(log(states)) block-sized eliminations and O(log(states))
+#   stored blocks — no per-state storage and no Monte Carlo paths
+# - The duration and its second moment are solved together as one
+#   block-triangular system: (I - Q) t = 1 and (I - Q) s = 1 + 2 Q t
+
+MAX_STEP = 500  # widest win/loss step (lattice points) solved; blocks are this wide
+MAX_STATES = 10 ** 12  # elimination error grows with the state count; beyond this it shows
+
+
+def profile_odds(difficulty=None):
+    """Win probability and net payout (bet units) of a bet on Red.
+
+    None is the fair game; otherwise a DIFFICULTY_LEVELS name. Matches the
+    payouts used by the Monte Carlo simulation.
+    """
+    chosen_idx = colors.index("Red")
+    if difficulty is None:
+        p = fair_probabilities[chosen_idx]
+        return p, (1 - p) / p
+    config = DIFFICULTY_LEVELS[difficulty]
+    return config["probabilities"][chosen_idx], config["payout_multiplier"]
+
+
+def _block_row(p, up, down, n, block, k):
+    """Couplings of block row k of I - Q to blocks k-1, k and k+1, for n
+    transient states where a play moves +up with probability p and -down
+    otherwise, and each row's chance of being absorbed in one play (rows
+    past n are identity padding, absorbed at once)"""
+    rows = np.arange(k * block, (k + 1) * block)
+    out = np.zeros((3, block, block))
+    out[1, np.arange(block), np.arange(block)] = 1.0
+    absorbed = (rows >= n).astype(np.float64)
+    for step, prob in ((up, p), (-down, 1 - p)):
+        dst = rows + step
+        keep = (rows < n) & (dst >= 0) & (dst < n)
+        absorbed[(rows < n) & ~keep] += prob
+        src, dst = rows[keep], dst[keep]
+        out[dst // block - k + 1, src - k * block, dst % block] -= prob  # offset -1, 0 or +1 by construction
+    return out, absorbed
+
+
+# The duration t and its second moment s solve one block-triangular system,
+# [[A, 0], [-2Q, A]] (t, s) = (1, 1) with A = I - Q, and every block of its
+# eliminations keeps that shape. Such a block is stored as the pair (X, Y)
+# for [[X, 0], [Y, X]]; right-hand sides are stored as (top, bottom).
+
+def _mul(a, b):
+    return a[0] @ b[0], a[1] @ b[0] + a[0] @ b[1]
+
+
+def _add(a, b):
+    return a[0] + b[0], a[1] + b[1]
+
+
+def _sub(a, b):
+    return a[0] - b[0], a[1] - b[1]
+
+
+def _neg(a):
+    return -a[0], -a[1]
+
+
+def _solve(e, rhs):
+    top = np.linalg.solve(e[0], rhs[0])
+    return top, np.linalg.solve(e[0], rhs[1] - e[1] @ top)
+
+
+def _set_diagonal(x, absorbed, *couplings):
+    """Rebuild the diagonal of an M-matrix block from everything else in its
+    rows: a row of I - Q sums to its absorption chance, so the diagonal is
+    that minus the other (non-positive) entries. Summing terms of one sign
+    keeps the diagonal exact where the row nearly cancels, as in long runs
+    of a fair game (the Grassmann-Taksar-Heyman trick)."""
+    off = x.copy()
+    np.fill_diagonal(off, 0.0)
+    np.fill_diagonal(x, absorbed - off.sum(axis=1) - sum(c.sum(axis=1) for c in couplings))
+
+
+def _join(left, right, diag, rhs):
+    """Eliminate the block row between two runs.
+
+    A run between ports a and b is (A11, A12, A21, A22, b1, b2): what its
+    eliminated rows add to the port equations, a: A11 x_a + A12 x_b = b1
+    and b: A21 x_a + A22 x_b = b2. Joining two runs through one more
+    interior row (diagonal block diag, right-hand side rhs) turns that row's
+    unknowns into eliminated ones.
+    """
+    a11, a12, a21, a22, b1, b2 = left
+    c11, c12, c21, c22, d1, d2 = right
+    e = _add(_add(diag, a22), c11)
+    # Interior rows are never absorbed: all their mass moves on to the ports
+    _set_diagonal(e[0], 0.0, a21[0], c12[0])
+    m = diag[0].shape[0]
+    x = _solve(e, tuple(np.hstack([a21[h], c12[h], rhs[h] + b2[h] + d1[h]]) for h in (0, 1)))
+    xa, xc, xr = ((x[0][:, i], x[1][:, i]) for i in (slice(0, m), slice(m, 2 * m), slice(2 * m, None)))
+    return (_sub(a11, _mul(a12, xa)), _mul(_neg(a12), xc),
+            _mul(_neg(c21), xa), _sub(c22, _mul(c21, xc)),
+            _sub(b1, _mul(a12, xr)), _sub(d2, _mul(c21, xr)))
+
+
+def _segment_solve(p, up, down, n, start, targets):
+    """Expected plays t, second moment s and absorption probabilities from
+    start.
+
+    targets lists the absorption columns as (state, probability) pairs: the
+    chance of leaving state for that absorbing bankroll in one play. The
+    block rows of start and of the two ends are kept; every uniform run in
+    between is reduced to its effect on those rows by doubling, and the
+    remaining few rows are solved densely. I - Q of an absorbing chain is a
+    nonsingular M-matrix, and so is every Schur complement taken here.
+    """
+    block = max(up, down)
+    blocks = -(-n // block)
+    rows = {}
+
+    def row(k):
+        if k not in rows:
+            (lower, diag, upper), absorbed = _block_row(p, up, down, n, block, k)
+            rows[k] = (lower, 2 * lower), (diag, 2 * (diag - np.eye(block))), (upper, 2 * upper), absorbed
+        return rows[k]
+
+    def rhs(k):
+        states = np.arange(k * block, (k + 1) * block)
+        top = np.zeros((block, 1 + len(targets)))
+        bottom = np.zeros_like(top)
+        top[:, 0] = bottom[:, 0] = states < n
+        for col, (state, prob) in enumerate(targets, start=1):
+            if k * block <= state < (k + 1) * block:
+                top[state - k * block, col] = prob
+        return top, bottom
+
+    kept = sorted(k for k in {0, start // block, blocks - 2, blocks - 1} if k >= 0)
+    zero = (np.zeros((block, block)), np.zeros((block, block)))
+    # Absorption only enters through the kept end rows, so runs carry just
+    # the duration column
+    zero_rhs = (np.zeros((block, 1)), np.zeros((block, 1)))
+
+    # Runs strictly between kept rows only hold interior rows (after row 0
+    # and before blocks - 2), which all share one block row and a right-hand
+    # side of ones. A run of l rows is two runs of about l / 2 joined through
+    # one row, so it is built bottom-up from the lengths each level needs,
+    # keeping only the level below
+    def run(length, lower, upper):
+        if length == 0:
+            return (zero, upper, lower, zero, zero_rhs, zero_rhs)
+        levels = [{length}]
+        while max(levels[-1]) > 0:
+            levels.append({part for l in levels[-1] if l for part in ((l - 1) // 2, l - 1 - (l - 1) // 2)})
+        lo, diag, hi, _ = row(1)
+        interior_rhs = (np.ones((block, 1)), np.ones((block, 1)))
+        done = {}
+        for level in reversed(levels):
+            done = {l: _join(done[(l - 1) // 2], done[l - 1 - (l - 1) // 2], diag, interior_rhs) if l
+                    else (zero, hi, lo, zero, zero_rhs, zero_rhs) for l in level}
+        return done[length]
+
+    size = len(kept) * block
+    system = (np.zeros((size, size)), np.zeros((size, size)))
+    right = (np.zeros((size, 1 + len(targets))), np.zeros((size, 1 + len(targets))))
+    absorbed = np.empty(size)
+    span = [slice(i * block, (i + 1) * block) for i in range(len(kept))]
+    for i, k in enumerate(kept):
+        _, diag, _, absorbed[span[i]] = row(k)
+        parts = [(i, i, diag)]
+        top, bottom = rhs(k)
+        right[0][span[i]] += top
+        right[1][span[i]] += bottom
+        if i + 1 < len(kept):
+            a11, a12, a21, a22, b1, b2 = run(kept[i + 1] - k - 1, row(kept[i + 1])[0], row(k)[2])
+            parts += [(i, i, a11), (i, i + 1, a12), (i + 1, i, a21), (i + 1, i + 1, a22)]
+            for half in (0, 1):
+                right[half][span[i], :1] += b1[half]
+                right[half][span[i + 1], :1] += b2[half]
+        for r, c, m in parts:
+            for half in (0, 1):
+                system[half][span[r], span[c]] += m[half]
+    _set_diagonal(system[0], absorbed)
+    x = _solve(system, right)
+
+    at = kept.index(start // block) * block + start % block
+    return x[0][at, 0], x[1][at, 0], x[0][at, 1:]
+
+
+def ruin_analysis(bankroll, bet, target=None, p=None, payout_net=None, difficulty=None):
+    """Exact outcome of betting bet on Red until ruin or reaching target.
+
+    Odds come from p/payout_net if given, otherwise from the difficulty
+    profile (None = fair). target defaults to doubling the bankroll.
+    Returns ruin/target probabilities, expected duration and its standard
+    deviation, and the distribution of the final bankroll.
+    """
+    if p is None or payout_net is None:
+        p, payout_net = profile_odds(difficulty)
+    target = 2 * bankroll if target is None else target
+    if not 0 < bet <= bankroll < target:
+        raise ValueError("Need 0 < bet <= bankroll < target")
+
+    bet_c, win_c, bank_c, target_c = to_cents(bet), win_cents(bet, payout_net), to_cents(bankroll), to_cents(target)
+    unit = math.gcd(math.gcd(bet_c, win_c), bank_c)
+    down, up = bet_c // unit, win_c // unit
+    top = -(-target_c // unit)  # first lattice point at or above the target
+
+    # Transient states are lattice bankrolls in [bet, target); state i holds
+    # bankroll (down + i) * unit
+    n = top - down
+    if max(up, down) > MAX_STEP:
+        raise ValueError(f"On a ${unit / 100:.2f} lattice one play moves the bankroll {max(up, down):,} points, "
+                         f"past the {MAX_STEP:,} this solver handles; use rounder bankroll and bet amounts")
+    if n > MAX_STATES:
+        raise ValueError(f"{n:,} bankroll states is past the {MAX_STATES:,} this solver handles accurately")
+    start = bank_c // unit - down
+
+    # Absorption: a loss from state i < down ends below one bet; a win from
+    # state i >= n - up reaches the target
+    ruin_states = np.arange(min(down, n))
+    goal_states = np.arange(max(n - up, 0), n)
+    targets = [(i, 1 - p) for i in ruin_states] + [(i, p) for i in goal_states]
+    duration, second_moment, final_prob = _segment_solve(p, up, down, n, start, targets)
+
+    final_bankroll = from_cents(np.concatenate([ruin_states, goal_states + down + up]) * unit)
+    # Rounding error can leave probabilities a few ulps outside [0, 1]
+    final_prob = np.clip(final_prob, 0.0, 1.0)
+    duration = float(duration)
+    variance = max(float(second_moment) - duration ** 2, 0.0)
+    return {
+        "bankroll": bankroll,
+        "bet": bet,
+        "target": target,
+        "win_probability": p,
+        "payout_net": payout_net,
+        "states": n,
+        "ruin_probability": min(float(final_prob[:len(ruin_states)].sum()), 1.0),
+        "target_probability": min(float(final_prob[len(ruin_states):].sum()), 1.0),
+        "expected_plays": duration,
+        "std_plays": math.sqrt(variance),
+        "expected_final_bankroll": float(final_prob @ final_bankroll),
+        "final_bankroll": final_bankroll.tolist(),
+        "final_probability": final_prob.tolist(),
+    }
+
+
+def monte_carlo_ruin(bankroll, bet, target=None, p=None, payout_net=None, difficulty=None,
+                     paths=100_000, max_plays=1_000_000, rng=None):
+    """Monte Carlo cross-check of ruin_analysis (all paths stepped together)"""
+    if p is None or payout_net is None:
+        p, payout_net = profile_odds(difficulty)
+    target = 2 * bankroll if target is None else target
+    rng = np.random.default_rng() if rng is None else rng
+    cash = np.full(paths, to_cents(bankroll), dtype=np.int64)
+    plays = np.zeros(paths, dtype=np.int64)
+    active = np.ones(paths, dtype=bool)
+    bet_c, win_c, target_c = to_cents(bet), win_cents(bet, payout_net), to_cents(target)
+    for _ in range(max_plays):
+        idx = np.flatnonzero(active)
+        if idx.size == 0:
+            break
+        wins = rng.random(idx.size) < p
+        cash[idx] += np.where(wins, win_c, -bet_c)
+        plays[idx] += 1
+        active[idx] = (cash[idx] >= bet_c) & (cash[idx] < target_c)
+    return {
+        "ruin_probability": float((cash < bet_c).mean()),
+        "expected_plays": float(plays.mean()),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exact gambler's ruin for the color game")
+    parser.add_argument("--bankroll", type=float, default=500.0, help="Starting bankroll (default: 500)")
+    parser.add_argument("--bet", type=float, default=100.0, help="Bet per play (default: 100)")
+    parser.add_argument("--target", type=float, default=None, help="Stop once the bankroll reaches this (default: double the bankroll)")
+    parser.add_argument("--difficulty", choices=list(DIFFICULTY_LEVELS), default=None,
+                        help="Only this difficulty level (default: fair game and every level)")
+    parser.add_argument("--check", type=int, default=0, help="Also run this many Monte Carlo paths per profile")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for --check")
+    args = parser.parse_args()
+
+    profiles = [args.difficulty] if args.difficulty else [None] + list(DIFFICULTY_LEVELS)
+    rng = np.random.default_rng(args.seed)
+    target = args.target or 2 * args.bankroll
+    print(f"${args.bankroll:,.2f} bankroll, ${args.bet:,.2f} bets on Red, stop at ${target:,.2f}")
+    for difficulty in profiles:
+        start = time.perf_counter()
+        r = ruin_analysis(args.bankroll, args.bet, args.target, difficulty=difficulty)
+        elapsed = (time.perf_counter() - start) * 1000
+        print("---")
+        print(f"{difficulty or 'Fair'} (p = {r['win_probability']:.3f}, pays {r['payout_net']:g}:1)")
+        print(f"Ruin: {r['ruin_probability']*100:.3f}%   Reach target: {r['target_probability']*100:.3f}%")
+        print(f"Plays: {r['expected_plays']:,.1f} expected (std {r['std_plays']:,.1f})")
+        print(f"Expected final bankroll: ${r['expected_final_bankroll']:,.2f}")
+        print(f"Solved {r['states']:,} states in {elapsed:.1f} ms")
+        if args.check:
+            mc = monte_carlo_ruin(args.bankroll, args.bet, args.target, difficulty=difficulty, paths=args.check, rng=rng)
+            print(f"Monte Carlo: ruin {mc['ruin_probability']*100:.3f}%, {mc['expected_plays']:,.1f} plays")
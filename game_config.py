@@ -0,0 +1,34 @@
+# Game configuration shared by the app, the CLI tools and the analysis modules
+# - Six colors, the player always bets on Red (index 0)
+# - Difficulty levels are the rigged variants offered by the Streamlit app
+# - payout_multiplier is the net payout: a winning bet keeps its stake and
+#   wins payout_multiplier x bet on top ("pays 4.9:1"); the fair game pays
+#   5:1 at 1/6. Every consumer (play tab, simulation, ruin, calibration)
+#   uses this meaning
+
+colors = ["Red", "Blue", "Yellow", "Green", "White", "Purple"]
+fair_probabilities = [1/6] * 6
+
+# Difficulty levels for tweaked game
+DIFFICULTY_LEVELS = {
+    "Slightly Rigged": {
+        "probabilities": [0.14, 0.172, 0.172, 0.172, 0.172, 0.172],
+        "payout_multiplier": 4.9,
+        "description": "Barely noticeable... or is it?"
+    },
+    "Moderately Unfair": {
+        "probabilities": [0.12, 0.176, 0.176, 0.176, 0.176, 0.176],
+        "payout_multiplier": 4.5,
+        "description": "The house is smilin' now"
+    },
+    "Heavily Stacked": {
+        "probabilities": [0.10, 0.18, 0.18, 0.18, 0.18, 0.18],
+        "payout_multiplier": 4.0,
+        "description": "You're gonna lose, pal"
+    },
+    "Almost Impossible": {
+        "probabilities": [0.05, 0.19, 0.19, 0.19, 0.19, 0.19],
+        "payout_multiplier": 3.5,
+        "description": "Don't even bother tryin'"
+    }
+}
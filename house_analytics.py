@@ -0,0 +1,183 @@
+import itertools
+import json
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from accounting import CENTS
+
+# Process-wide live house analytics
+# - Every roll in every session is reported here; the house take is
+#   aggregated per mode and difficulty over rolling time windows
+# - Recording never takes a lock: each thread writes to its own shard
+#   (current time bucket -> counters) and seals the bucket itself when the
+#   clock moves on
+# - A background merger folds sealed buckets from all shards into the
+#   shared totals every few seconds, and retires shards of finished threads
+#   (Streamlit runs every rerun on a fresh thread)
+# - Snapshots add the still-open buckets read-only, so numbers are live
+
+BUCKET_SECONDS = 10
+WINDOWS = {"1 min": 60, "15 min": 15 * 60, "1 h": 60 * 60}
+MERGE_INTERVAL = 5.0
+
+# Counter slots per (mode, difficulty)
+PLAYS, WINS, WAGERED, TAKE = range(4)
+
+
+class _Shard:
+    """Counters written by one thread only"""
+
+    def __init__(self):
+        self.thread = threading.current_thread()
+        self.bucket = None
+        self.current = {}
+        self.sealed = deque()  # (bucket, counters), appended by the owner, popped by the merger
+
+
+class HouseAnalytics:
+    def __init__(self, merge_interval=MERGE_INTERVAL, windows=WINDOWS):
+        self.windows = windows
+        self._local = threading.local()
+        self._ids = itertools.count()
+        self._shards = {}
+        self._lock = threading.Lock()  # held by mergers only, never on the roll path
+        self._buckets = {}  # bucket -> {key: counters}, merged
+        self._lifetime = {}  # key -> counters, everything already merged
+        self.started = time.time()
+
+        self._stop = threading.Event()
+        if merge_interval:
+            threading.Thread(target=self._merge_loop, args=(merge_interval,), daemon=True).start()
+
+    def _new_shard(self):
+        shard = self._local.shard = _Shard()
+        self._shards[next(self._ids)] = shard
+        return shard
+
+    @staticmethod
+    def _seal(shard, bucket):
+        if shard.current:
+            shard.sealed.append((shard.bucket, shard.current))
+        shard.bucket = bucket
+        shard.current = {}
+
+    def _counters(self, key):
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+        bucket = int(time.time()) // BUCKET_SECONDS
+        if bucket != shard.bucket:
+            self._seal(shard, bucket)
+        counters = shard.current.get(key)
+        if counters is None:
+            counters = shard.current[key] = [0, 0, 0, 0]
+        return counters
+
+    def record(self, mode, difficulty, bet, profit):
+        """One roll: bet and player profit in dollars (the per-roll hot path)"""
+        c = self._counters((mode, difficulty))
+        profit_cents = round(profit * CENTS)
+        c[PLAYS] += 1
+        c[WINS] += profit_cents > 0
+        c[WAGERED] += round(bet * CENTS)
+        c[TAKE] -= profit_cents
+
+    def record_many(self, mode, difficulty, bet, profits):
+        """A batch of rolls at one bet (e.g. an auto-roll); profits in dollars"""
+        cents = np.round(np.asarray(profits) * CENTS).astype(np.int64)
+        c = self._counters((mode, difficulty))
+        c[PLAYS] += cents.size
+        c[WINS] += int(np.count_nonzero(cents > 0))
+        c[WAGERED] += round(bet * CENTS) * cents.size
+        c[TAKE] -= int(cents.sum())
+
+    @staticmethod
+    def _add(target, counts):
+        for key, values in counts.items():
+            acc = target.get(key)
+            if acc is None:
+                target[key] = list(values)
+            else:
+                for i, v in enumerate(values):
+                    acc[i] += v
+
+    def _drain(self, shard):
+        while shard.sealed:
+            bucket, counts = shard.sealed.popleft()
+            self._add(self._buckets.setdefault(bucket, {}), counts)
+            self._add(self._lifetime, counts)
+
+    def merge(self):
+        """Fold sealed buckets into the shared totals and drop finished threads' shards"""
+        oldest = int(time.time()) // BUCKET_SECONDS - max(self.windows.values()) // BUCKET_SECONDS
+        with self._lock:
+            for shard_id, shard in list(self._shards.items()):
+                self._drain(shard)
+                if not shard.thread.is_alive():
+                    # Nobody writes to it any more, so the open bucket is final; drain
+                    # again first, the owner may have sealed a bucket since the drain above
+                    self._drain(shard)
+                    if shard.current:
+                        self._add(self._buckets.setdefault(shard.bucket, {}), shard.current)
+                        self._add(self._lifetime, shard.current)
+                    del self._shards[shard_id]
+            for bucket in [b for b in self._buckets if b < oldest]:
+                del self._buckets[bucket]
+
+    def _merge_loop(self, interval):
+        while not self._stop.wait(interval):
+            self.merge()
+
+    def snapshot(self):
+        """Per-window and lifetime totals per (mode, difficulty), JSON-ready"""
+        self.merge()
+        now_bucket = int(time.time()) // BUCKET_SECONDS
+        with self._lock:
+            buckets = {b: {k: list(v) for k, v in counts.items()} for b, counts in self._buckets.items()}
+            lifetime = {k: list(v) for k, v in self._lifetime.items()}
+        # Open buckets of live threads, read without stopping them
+        for shard in list(self._shards.values()):
+            bucket, current = shard.bucket, dict(shard.current)
+            if bucket is not None and current:
+                self._add(buckets.setdefault(bucket, {}), current)
+                self._add(lifetime, current)
+
+        def rows(counts):
+            out = []
+            for (mode, difficulty), c in sorted(counts.items(), key=lambda item: (item[0][0], str(item[0][1]))):
+                out.append({
+                    "mode": mode,
+                    "difficulty": difficulty or "-",
+                    "plays": c[PLAYS],
+                    "wins": c[WINS],
+                    "wagered": c[WAGERED] / CENTS,
+                    "house_take": c[TAKE] / CENTS,
+                    "house_edge": c[TAKE] / c[WAGERED] if c[WAGERED] else None,
+                })
+            return out
+
+        windows = {}
+        for name, seconds in self.windows.items():
+            since = now_bucket - seconds // BUCKET_SECONDS + 1
+            counts = {}
+            for bucket, bucket_counts in buckets.items():
+                if bucket >= since:
+                    self._add(counts, bucket_counts)
+            windows[name] = rows(counts)
+        return {
+            "generated": time.time(),
+            "uptime_seconds": time.time() - self.started,
+            "live_threads": len(self._shards),
+            "windows": windows,
+            "lifetime": rows(lifetime),
+        }
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2)
+
+    def close(self):
+        self._stop.set()
@@ -0,0 +1,208 @@
+import argparse
+import json
+import os
+import pickle
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from roll_log import SessionSummary
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Offline load test for the Streamlit app
+# - Drives N headless sessions of streamlit_app.py through Streamlit's AppTest
+# - Each session plays a random mix of rolls, resets, mode switches and full
+#   simulations, timing every rerun
+# - Reports p50/p95/p99 rerun latency and CPU per interaction, plus
+#   per-session state size and peak memory
+#
+# AppTest swaps process-global runtime state on every run, so sessions are
+# run in separate worker processes rather than threads. Nothing touches the
+# network; the app is executed in-process exactly as a server would run it.
+# The workers' roll log and result store live in a scratch directory that is
+# deleted afterwards, so a load test never writes to the real ones.
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "streamlit_app.py")
+
+DEFAULT_MIX = {
+    "roll": 0.80,
+    "reset": 0.03,
+    "mode": 0.07,
+    "simulate": 0.10,
+}
+
+PERCENTILES = (50, 95, 99)
+
+
+def _click(at, label):
+    button = next(b for b in at.button if label in b.label)
+    button.click().run()
+
+
+def _toggle_mode(at):
+    radio = at.sidebar.radio[0]
+    radio.set_value("Tweaked" if radio.value == "Fair" else "Fair").run()
+
+
+ACTIONS = {
+    "roll": lambda at: _click(at, "ROLL THE DICE"),
+    "auto": lambda at: _click(at, "AUTO-ROLL"),
+    "reset": lambda at: _click(at, "Reset Game"),
+    "mode": _toggle_mode,
+    "simulate": lambda at: _click(at, "Run Full Simulation"),
+}
+
+
+def _prefill_history(at, history, seed):
+    """Give the session a long play history, as if it had been rolling for a while"""
+    rng = np.random.default_rng(seed)
+    wins = rng.random(history) < 1 / 6
+    profits = np.where(wins, 40.0, -10.0)
+    at.session_state["plays"] = history
+    at.session_state["total_profit"] = float(profits.sum())
+    live_chart = SessionSummary()
+    for w, profit in zip(wins, profits.tolist()):
+        live_chart.add(0 if w else 1, profit)
+    at.session_state["live_chart"] = live_chart
+
+
+def _state_bytes(at):
+    """Pickled size of the session's state, skipping values that can't be pickled"""
+    total = 0
+    for value in at.session_state.values():
+        try:
+            total += len(pickle.dumps(value))
+        except Exception:
+            pass
+    return total
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+
+
+def _isolate_storage(scratch):
+    """Worker initializer: point the app's roll log and result store at the scratch directory"""
+    import result_store
+    import roll_log
+
+    roll_log.DEFAULT_PATH = os.path.join(scratch, f"roll_log_{os.getpid()}.sqlite3")
+    result_store.DEFAULT_ROOT = os.path.join(scratch, "result_store")
+
+
+def run_session(session_idx, interactions, mix, history, sim_plays, seed, timeout):
+    """Drive one headless session and return its timing samples"""
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed + session_idx)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    at.run()
+    if history:
+        _prefill_history(at, history, seed + session_idx)
+    if sim_plays:
+        at.slider[0].set_value(sim_plays)
+    at.run()
+
+    samples = []
+    errors = 0
+    for _ in range(interactions):
+        action = rng.choices(names, weights)[0]
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        ACTIONS[action](at)
+        samples.append({
+            "action": action,
+            "wall": time.perf_counter() - wall_start,
+            "cpu": time.process_time() - cpu_start,
+        })
+        if at.exception:
+            errors += 1
+
+    return {
+        "session": session_idx,
+        "samples": samples,
+        "errors": errors,
+        "state_bytes": _state_bytes(at),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def summarize(sessions):
+    """Latency/CPU percentiles per action and overall, plus memory per session"""
+    samples = [s for session in sessions for s in session["samples"]]
+    groups = {"all": samples}
+    for s in samples:
+        groups.setdefault(s["action"], []).append(s)
+
+    actions = {}
+    for name, group in groups.items():
+        wall = np.array([s["wall"] for s in group]) * 1000
+        cpu = np.array([s["cpu"] for s in group]) * 1000
+        actions[name] = {
+            "count": len(group),
+            **{f"p{p}_ms": float(np.percentile(wall, p)) for p in PERCENTILES},
+            "mean_cpu_ms": float(cpu.mean()),
+        }
+
+    rss = [s["peak_rss_mb"] for s in sessions if s["peak_rss_mb"] is not None]
+    return {
+        "sessions": len(sessions),
+        "errors": sum(s["errors"] for s in sessions),
+        "actions": actions,
+        "mean_state_kb": float(np.mean([s["state_bytes"] for s in sessions])) / 1024,
+        "mean_peak_rss_mb": float(np.mean(rss)) if rss else None,
+    }
+
+
+def print_report(report):
+    print(f"Sessions: {report['sessions']}  (errors: {report['errors']})")
+    print(f"{'action':<10}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'cpu ms':>10}")
+    for name, a in report["actions"].items():
+        print(f"{name:<10}{a['count']:>7}{a['p50_ms']:>10.1f}{a['p95_ms']:>10.1f}{a['p99_ms']:>10.1f}{a['mean_cpu_ms']:>10.1f}")
+    print(f"Session state: {report['mean_state_kb']:.1f} KiB per session")
+    if report["mean_peak_rss_mb"] is not None:
+        print(f"Peak RSS: {report['mean_peak_rss_mb']:.1f} MiB per session process")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline load test for streamlit_app.py")
+    parser.add_argument("--sessions", type=int, default=4, help="Number of concurrent sessions (default: 4)")
+    parser.add_argument("--interactions", type=int, default=25, help="Interactions per session (default: 25)")
+    parser.add_argument("--history", type=int, default=0, help="Pre-existing plays in each session's history (default: 0)")
+    parser.add_argument("--sim-plays", type=int, default=None, help="Plays per 'Run Full Simulation' (default: app default)")
+    parser.add_argument("--mix", type=str, default=None, help='Action weights as JSON, e.g. \'{"roll": 0.9, "simulate": 0.1}\'')
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the action mix (default: 0)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-rerun timeout in seconds (default: 120)")
+    parser.add_argument("--json", type=str, default=None, help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    mix = json.loads(args.mix) if args.mix else DEFAULT_MIX
+    unknown = set(mix) - set(ACTIONS)
+    if unknown:
+        parser.error(f"Unknown actions in --mix: {', '.join(sorted(unknown))}")
+
+    with tempfile.TemporaryDirectory(prefix="load_test_") as scratch, \
+            ProcessPoolExecutor(max_workers=args.sessions, initializer=_isolate_storage, initargs=(scratch,)) as pool:
+        futures = [
+            pool.submit(run_session, i, args.interactions, mix, args.history, args.sim_plays, args.seed, args.timeout)
+            for i in range(args.sessions)
+        ]
+        sessions = [f.result() for f in futures]
+
+    report = summarize(sessions)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
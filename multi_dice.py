@@ -0,0 +1,141 @@
+import argparse
+import math
+import time
+
+import numpy as np
+
+from game_config import colors, fair_probabilities, DIFFICULTY_LEVELS
+
+# Multi-dice perya variant
+# - Several dice are dropped per play; the player bets on one color
+# - Net payout depends on how many dice show that color (perya: 1:1, 2:1, 3:1)
+# - Each die can have its own face biases (DIFFICULTY_LEVELS-style vectors)
+# - Exact expected value/variance by enumerating the match count distribution
+# - Vectorized Monte Carlo that draws a (chunk x dice) matrix at a time
+
+# Net payout per matching die count; zero matches loses the bet
+PERYA_PAYOUTS = {1: 1.0, 2: 2.0, 3: 3.0}
+
+DEFAULT_CHUNK_ROWS = 1 << 22  # rows of the (chunk x dice) draw matrix
+
+
+def _die_probabilities(probs, dice):
+    """Normalize probs to one row of face probabilities per die"""
+    probs = np.asarray(probs, dtype=np.float64)
+    if probs.ndim == 1:
+        probs = np.tile(probs, (dice, 1))
+    if probs.shape[0] != dice:
+        raise ValueError(f"Expected {dice} rows of face probabilities, got {probs.shape[0]}")
+    if not np.allclose(probs.sum(axis=1), 1.0):
+        raise ValueError("Face probabilities of every die must sum to 1")
+    return probs
+
+
+def _payout_table(payouts, dice):
+    """Net profit per bet unit for 0..dice matches"""
+    table = np.full(dice + 1, -1.0)
+    for matches, net in payouts.items():
+        if not 1 <= matches <= dice:
+            raise ValueError(f"Payout given for {matches} matches with only {dice} dice")
+        table[matches] = net
+    return table
+
+
+def match_distribution(probs, dice=3, chosen_idx=0):
+    """Exact probability of 0..dice dice showing the chosen color.
+
+    Each die is a Bernoulli trial on its own chosen-face probability, so the
+    count is enumerated by convolving the dice one at a time. With identical
+    dice this is the binomial marginal of the full multinomial.
+    """
+    p = _die_probabilities(probs, dice)[:, chosen_idx]
+    dist = np.array([1.0])
+    for p_die in p:
+        dist = np.convolve(dist, [1.0 - p_die, p_die])
+    return dist
+
+
+def exact_stats(probs, dice=3, payouts=PERYA_PAYOUTS, chosen_idx=0, bet=1.0):
+    """Exact expected profit, variance and house edge of one multi-dice play"""
+    dist = match_distribution(probs, dice, chosen_idx)
+    profit = _payout_table(payouts, dice) * bet
+    mean = float(dist @ profit)
+    variance = float(dist @ (profit - mean) ** 2)
+    return {
+        "dice": dice,
+        "match_probabilities": dist.tolist(),
+        "mean": mean,
+        "variance": variance,
+        "std": math.sqrt(variance),
+        "win_rate": float(dist[1:].sum()),
+        "house_edge": -mean / bet,
+    }
+
+
+def simulate_multi_dice(probs, plays, dice=3, payouts=PERYA_PAYOUTS, chosen_idx=0, bet=1.0,
+                        chunk_rows=DEFAULT_CHUNK_ROWS, rng=None):
+    """Monte Carlo over plays multi-dice rounds without keeping per-play data.
+
+    Each chunk draws a (rows x dice) matrix of uniforms; a die shows the
+    chosen color when its uniform falls below that die's probability, so
+    only the match count per row is ever materialized.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    p_chosen = _die_probabilities(probs, dice)[:, chosen_idx].astype(np.float32)
+    table = _payout_table(payouts, dice) * bet
+
+    match_counts = np.zeros(dice + 1, dtype=np.int64)
+    done = 0
+    while done < plays:
+        rows = min(chunk_rows, plays - done)
+        u = rng.random((rows, dice), dtype=np.float32)
+        matches = (u < p_chosen).sum(axis=1)
+        match_counts += np.bincount(matches, minlength=dice + 1)
+        done += rows
+
+    # Every play's profit is one of dice + 1 values, so the counts give
+    # exact totals and moments
+    total = float(match_counts @ table)
+    mean = total / plays
+    variance = float(match_counts @ (table - mean) ** 2) / plays
+    return {
+        "dice": dice,
+        "plays": plays,
+        "bet": bet,
+        "match_counts": match_counts.tolist(),
+        "total": total,
+        "mean": mean,
+        "std": math.sqrt(variance),
+        "win_rate": float(match_counts[1:].sum()) / plays,
+        "house_edge": -mean / bet,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Multi-dice perya color game — exact odds and Monte Carlo")
+    parser.add_argument("--dice", type=int, default=3, help="Dice dropped per play (default: 3)")
+    parser.add_argument("--plays", type=int, default=10_000_000, help="Monte Carlo plays per profile (default: 10,000,000)")
+    parser.add_argument("--bet", type=float, default=1.0, help="Bet amount per play (default: 1.0)")
+    parser.add_argument("--payouts", type=float, nargs="+", default=None,
+                        help="Net payout for 1, 2, ... matching dice (default: 1 2 3 ..., the perya schedule)")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for the Monte Carlo draws")
+    args = parser.parse_args()
+
+    payout_values = args.payouts or list(range(1, args.dice + 1))
+    payouts = {i + 1: float(v) for i, v in enumerate(payout_values)}
+    rng = np.random.default_rng(args.seed)
+
+    profiles = {"Fair": fair_probabilities}
+    profiles.update({name: cfg["probabilities"] for name, cfg in DIFFICULTY_LEVELS.items()})
+
+    print(f"{args.dice} dice, betting on {colors[0]}, payouts {payouts}, {args.plays:,} plays per profile")
+    for name, probs in profiles.items():
+        exact = exact_stats(probs, args.dice, payouts, bet=args.bet)
+        start = time.perf_counter()
+        sim = simulate_multi_dice(probs, args.plays, args.dice, payouts, bet=args.bet, rng=rng)
+        elapsed = time.perf_counter() - start
+        print("---")
+        print(f"{name}")
+        print(f"Exact:       mean ${exact['mean']:.5f}  std ${exact['std']:.4f}  house edge {exact['house_edge']*100:.3f}%")
+        print(f"Monte Carlo: mean ${sim['mean']:.5f}  std ${sim['std']:.4f}  house edge {sim['house_edge']*100:.3f}%")
+        print(f"Rolls/min:   {args.plays / elapsed * 60:,.0f}")
@@ -0,0 +1,182 @@
+import argparse
+import math
+import time
+from statistics import NormalDist
+
+import numpy as np
+
+from game_config import DIFFICULTY_LEVELS
+from gamblers_ruin import profile_odds
+
+# Population simulation of a night at the color game
+# - Every player arrives with their own bankroll, bet size and quitting rules
+#   (stop-loss, win goal, time budget), sampled from POPULATION-style configs
+# - Players are simulated together: each step draws one roll for every
+#   player still at the table and drops the ones who quit, so the work is
+#   proportional to plays actually made
+# - Players are processed in fixed-size cohorts, so memory stays bounded no
+#   matter how many players there are
+# - Money is kept in integer cents, so house take totals are exact and
+#   cohort results merge without rounding
+
+DEFAULT_POPULATION = {
+    # Lognormal starting bankroll in dollars, clipped to [min, max]
+    "bankroll": {"median": 200.0, "sigma": 0.8, "min": 20.0, "max": 5000.0},
+    # Bet per play as a fraction of the starting bankroll (whole dollars, at least $1)
+    "bet_fraction": {"choices": [0.02, 0.05, 0.10, 0.25], "weights": [0.30, 0.35, 0.25, 0.10]},
+    # Quit after losing this fraction of the starting bankroll (1.0 = play until broke)
+    "stop_loss": {"choices": [0.5, 1.0], "weights": [0.4, 0.6]},
+    # Quit once the bankroll reaches this multiple of the start (None = never)
+    "win_goal": {"choices": [1.5, 2.0, None], "weights": [0.3, 0.4, 0.3]},
+    # Time budget: geometric number of plays with this mean, capped
+    "max_plays": {"mean": 120, "cap": 2000},
+}
+
+DEFAULT_COHORT = 1 << 18  # players simulated together
+DEFAULT_QUANTILES = (0.01, 0.05, 0.5, 0.95, 0.99)
+QUIT_REASONS = ("broke", "stop_loss", "win_goal", "time")
+
+
+def _choice(rng, spec, size):
+    values = np.array([np.inf if v is None else v for v in spec["choices"]], dtype=np.float64)
+    weights = np.asarray(spec["weights"], dtype=np.float64)
+    return values[rng.choice(values.size, size=size, p=weights / weights.sum())]
+
+
+def sample_players(rng, size, population=DEFAULT_POPULATION):
+    """Starting bankroll, bet, stop/goal levels (cents) and play budget per player"""
+    b = population["bankroll"]
+    bankroll = np.clip(b["median"] * np.exp(b["sigma"] * rng.standard_normal(size)), b["min"], b["max"])
+    bankroll = np.round(bankroll).astype(np.int64) * 100
+    bet = np.maximum(np.round(bankroll * _choice(rng, population["bet_fraction"], size) / 100), 1).astype(np.int64) * 100
+    floor = np.round(bankroll * (1 - _choice(rng, population["stop_loss"], size))).astype(np.int64)
+    goal_multiple = _choice(rng, population["win_goal"], size)
+    no_goal = np.isinf(goal_multiple)
+    goal = np.round(bankroll * np.where(no_goal, 0.0, goal_multiple)).astype(np.int64)
+    goal[no_goal] = np.iinfo(np.int64).max
+    t = population["max_plays"]
+    max_plays = np.minimum(rng.geometric(1 / t["mean"], size), t["cap"]).astype(np.int64)
+    return bankroll, bet, floor, goal, max_plays
+
+
+class PopulationStats:
+    """Mergeable totals over players; per-player losses binned to whole dollars"""
+
+    def __init__(self):
+        self.players = 0
+        self.plays = 0
+        self.house_take_cents = 0
+        self.take_sq = 0.0  # sum of squared per-player take (dollars^2)
+        self.players_ahead = 0
+        self.quit_counts = dict.fromkeys(QUIT_REASONS, 0)
+        self.loss_counts = {}
+
+    def add_cohort(self, start, final, plays, reasons):
+        loss = start - final  # per-player house take, cents
+        self.players += loss.size
+        self.plays += int(plays.sum())
+        self.house_take_cents += int(loss.sum())
+        self.take_sq += float(((loss / 100) ** 2).sum())
+        self.players_ahead += int((loss < 0).sum())
+        for code, reason in enumerate(QUIT_REASONS):
+            self.quit_counts[reason] += int((reasons == code).sum())
+        dollars, counts = np.unique(np.floor_divide(loss, 100), return_counts=True)
+        for d, c in zip(dollars.tolist(), counts.tolist()):
+            self.loss_counts[d] = self.loss_counts.get(d, 0) + c
+
+    def merge(self, other):
+        self.players += other.players
+        self.plays += other.plays
+        self.house_take_cents += other.house_take_cents
+        self.take_sq += other.take_sq
+        self.players_ahead += other.players_ahead
+        for reason, count in other.quit_counts.items():
+            self.quit_counts[reason] += count
+        for d, c in other.loss_counts.items():
+            self.loss_counts[d] = self.loss_counts.get(d, 0) + c
+
+    def loss_quantiles(self, quantiles=DEFAULT_QUANTILES):
+        values = np.array(sorted(self.loss_counts), dtype=np.float64)
+        cdf = np.cumsum([self.loss_counts[v] for v in sorted(self.loss_counts)]) / self.players
+        return {q: float(values[np.searchsorted(cdf, q)]) for q in quantiles}
+
+    def summary(self, quantiles=DEFAULT_QUANTILES):
+        take = self.house_take_cents / 100
+        mean = take / self.players
+        std = math.sqrt(max(self.take_sq / self.players - mean ** 2, 0.0))
+        # Players are independent, so the night's take is approximately
+        # normal with mean n * mean and standard deviation sqrt(n) * std
+        night = NormalDist(take, std * math.sqrt(self.players)) if std > 0 else None
+        return {
+            "players": self.players,
+            "plays": self.plays,
+            "house_take": take,
+            "house_take_per_player": mean,
+            "house_take_per_player_std": std,
+            "house_take_quantiles": {q: night.inv_cdf(q) if night else take for q in quantiles},
+            "player_loss_quantiles": self.loss_quantiles(quantiles),
+            "players_ahead": self.players_ahead / self.players,
+            "quit_reasons": {r: c / self.players for r, c in self.quit_counts.items()},
+        }
+
+
+def simulate_cohort(rng, size, p, payout_net, population=DEFAULT_POPULATION):
+    """Play one cohort of players to the end; returns its PopulationStats"""
+    start, bet, floor, goal, max_plays = sample_players(rng, size, population)
+    win = np.round(bet * payout_net).astype(np.int64)
+    cash = start.copy()
+    plays = np.zeros(size, dtype=np.int64)
+    reasons = np.full(size, -1, dtype=np.int8)
+
+    active = np.flatnonzero(bet <= cash)
+    reasons[bet > cash] = 0
+    while active.size:
+        wins = rng.random(active.size) < p
+        cash[active] += np.where(wins, win[active], -bet[active])
+        plays[active] += 1
+
+        c = cash[active]
+        # First matching rule wins: broke, stop-loss, goal, out of time
+        reason = np.select(
+            [c < bet[active], c <= floor[active], c >= goal[active], plays[active] >= max_plays[active]],
+            [0, 1, 2, 3], default=-1,
+        ).astype(np.int8)
+        done = reason >= 0
+        reasons[active[done]] = reason[done]
+        active = active[~done]
+
+    stats = PopulationStats()
+    stats.add_cohort(start, cash, plays, reasons)
+    return stats
+
+
+def simulate_population(players, difficulty=None, population=DEFAULT_POPULATION, cohort_size=DEFAULT_COHORT, rng=None):
+    """Simulate a night of players betting on Red at one difficulty (None = fair)"""
+    rng = np.random.default_rng() if rng is None else rng
+    p, payout_net = profile_odds(difficulty)
+    stats = PopulationStats()
+    for done in range(0, players, cohort_size):
+        stats.merge(simulate_cohort(rng, min(cohort_size, players - done), p, payout_net, population))
+    return stats.summary()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate a population of players to forecast house revenue")
+    parser.add_argument("--players", type=int, default=100_000, help="Players in the night (default: 100,000)")
+    parser.add_argument("--difficulty", choices=["Fair"] + list(DIFFICULTY_LEVELS), default="Slightly Rigged",
+                        help="Game the house runs (default: Slightly Rigged)")
+    parser.add_argument("--cohort", type=int, default=DEFAULT_COHORT, help=f"Players simulated together (default: {DEFAULT_COHORT:,})")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for the player profiles and rolls")
+    args = parser.parse_args()
+
+    difficulty = None if args.difficulty == "Fair" else args.difficulty
+    start = time.perf_counter()
+    r = simulate_population(args.players, difficulty, cohort_size=args.cohort, rng=np.random.default_rng(args.seed))
+    elapsed = time.perf_counter() - start
+
+    print(f"{r['players']:,} players at {args.difficulty}, {r['plays']:,} plays in {elapsed:.1f}s")
+    print(f"House take: ${r['house_take']:,.2f} (${r['house_take_per_player']:.2f} per player, std ${r['house_take_per_player_std']:.2f})")
+    print("Night take quantiles: " + ", ".join(f"{q*100:g}% ${v:,.0f}" for q, v in r["house_take_quantiles"].items()))
+    print("Player loss quantiles: " + ", ".join(f"{q*100:g}% ${v:,.0f}" for q, v in r["player_loss_quantiles"].items()))
+    print(f"Players ahead: {r['players_ahead']*100:.1f}%")
+    print("Quit reasons: " + ", ".join(f"{k} {v*100:.1f}%" for k, v in r["quit_reasons"].items()))
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+# Content-addressed store for simulation results
+# - Shared by the CLI and the Streamlit app, survives restarts
+# - Key = hash of the engine version and every input that affects the result
+#   (probabilities, payout, bet, plays, seed, ...)
+# - Per entry: the win/loss outcome of every play as packed bits in a .npy
+#   file (opened with mmap) and the summary statistics as JSON; readers get
+#   the packed mmap and unpack only the plays they look at
+# - Writes go to a temp file and are renamed into place, so several processes
+#   can fill the same store; last access time drives LRU eviction
+
+ENGINE_VERSION = 6  # bump whenever the simulation engine changes its output
+
+# Read when a store is created, so tools such as the load test can point it elsewhere
+DEFAULT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".result_store")
+
+
+def _numeric_keys(pairs):
+    # JSON turns dict keys such as checkpoints (ints) and quantiles (floats)
+    # into strings; turn them back
+    out = {}
+    for key, value in pairs:
+        for cast in (int, float):
+            try:
+                key = cast(key)
+                break
+            except ValueError:
+                pass
+        out[key] = value
+    return out
+
+
+def unpack_wins(packed, start, count):
+    """Win flags of plays [start, start + count) from packed bits, reading only their bytes"""
+    first, skip = divmod(start, 8)
+    last = -(-(start + count) // 8)
+    return np.unpackbits(packed[first:last], count=skip + count)[skip:].astype(bool)
+
+
+class ResultStore:
+    def __init__(self, root=None, max_bytes=256 * 1024 * 1024):
+        self.root = root or DEFAULT_ROOT
+        self.max_bytes = max_bytes
+        os.makedirs(self.root, exist_ok=True)
+
+    @staticmethod
+    def key(**config):
+        """Content address for a simulation config"""
+        config = {"engine": ENGINE_VERSION, **config}
+        payload = json.dumps(config, sort_keys=True, default=lambda v: np.asarray(v).tolist())
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _paths(self, key):
+        base = os.path.join(self.root, key)
+        return base + ".npy", base + ".json"
+
+    def get(self, key, verify=None):
+        """Return {"packed_wins": packed bits (mmap), "stats": dict} or None on a miss.
+
+        Nothing is unpacked here; use unpack_wins for the plays you need.
+        verify(packed_wins) -> bool can spot-check the stored plays (e.g.
+        with counter_rng.spot_check); entries that fail it count as misses.
+        """
+        wins_path, stats_path = self._paths(key)
+        try:
+            with open(stats_path) as f:
+                stats = json.load(f, object_pairs_hook=_numeric_keys)
+            packed = np.load(wins_path, mmap_mode="r")
+        except (FileNotFoundError, ValueError):
+            return None
+        # Mark as recently used for eviction
+        for path in (wins_path, stats_path):
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        if verify is not None and not verify(packed):
+            return None
+        return {"packed_wins": packed, "stats": stats}
+
+    def put(self, key, packed_wins, stats):
+        """Store the per-play win flags (np.packbits) and the summary statistics of a run"""
+        wins_path, stats_path = self._paths(key)
+        self._write_atomic(wins_path, lambda f: np.save(f, packed_wins))
+        self._write_atomic(stats_path, lambda f: f.write(json.dumps(stats).encode()))
+        self.evict()
+
+    def _write_atomic(self, path, write):
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+
+    def evict(self):
+        """Delete least recently used entries until the store fits in max_bytes"""
+        entries = {}
+        total = 0
+        for entry in os.scandir(self.root):
+            name, ext = os.path.splitext(entry.name)
+            if ext not in (".npy", ".json"):
+                continue
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            size, last_used = entries.get(name, (0, 0.0))
+            entries[name] = (size + st.st_size, max(last_used, st.st_mtime))
+            total += st.st_size
+
+        for name, (size, _) in sorted(entries.items(), key=lambda item: item[1][1]):
+            if total <= self.max_bytes:
+                break
+            # Stats first: without them the entry is already a miss for readers
+            for path in reversed(self._paths(name)):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
@@ -0,0 +1,239 @@
+import atexit
+import os
+from collections import OrderedDict
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from accounting import from_cents, to_cents
+from game_config import colors
+
+# Persistent roll log
+# - Append-only SQLite database in WAL mode, shared by the app and the GUI
+# - Rolls are buffered in memory and written in batches, so recording a roll
+#   costs a list append and a few additions; a timer writes out whatever is
+#   still buffered once flush_interval has passed, even if no roll follows
+# - A per-session summary row (totals plus a fixed-size downsampled chart)
+#   lets a returning session restore its state with one indexed read instead
+#   of replaying every roll
+# - Summaries of recently active sessions stay in memory (LRU); older ones
+#   are dropped once flushed and read back from their row when needed
+
+# Read when a log is opened, so tools such as the load test can point it elsewhere
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "roll_log.sqlite3")
+
+CHART_POINTS = 512  # max points kept in a session's summary chart
+CACHED_SUMMARIES = 256  # flushed session summaries kept in memory
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rolls (
+    session TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    mode TEXT NOT NULL,
+    difficulty TEXT,
+    bet REAL NOT NULL,
+    outcome INTEGER NOT NULL,
+    profit REAL NOT NULL,
+    PRIMARY KEY (session, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sessions (
+    session TEXT PRIMARY KEY,
+    updated REAL NOT NULL,
+    plays INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    total_profit REAL NOT NULL,
+    last_outcome INTEGER,
+    last_profit REAL,
+    chart_stride INTEGER NOT NULL,
+    chart BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_updated ON sessions (updated);
+"""
+
+
+class SessionSummary:
+    """Running totals for one session plus a stride-doubling chart.
+
+    The chart keeps the cumulative profit after every chart_stride-th play.
+    When it fills up, every other point is dropped and the stride doubles,
+    so it never holds more than CHART_POINTS values. The total is kept in
+    integer cents, so it does not drift over long sessions.
+    """
+
+    def __init__(self, plays=0, wins=0, total_profit=0.0, last_outcome=None, last_profit=None,
+                 chart_stride=1, chart=()):
+        self.plays = plays
+        self.wins = wins
+        self.total_cents = to_cents(total_profit)
+        self.last_outcome = last_outcome
+        self.last_profit = last_profit
+        self.chart_stride = chart_stride
+        self.chart = list(chart)
+
+    def add(self, outcome, profit):
+        self.plays += 1
+        self.wins += profit > 0
+        self.total_cents += to_cents(profit)
+        self.last_outcome = outcome
+        self.last_profit = profit
+        if self.plays % self.chart_stride == 0:
+            self.chart.append(self.total_profit)
+            if len(self.chart) >= CHART_POINTS:
+                self.chart = self.chart[1::2]
+                self.chart_stride *= 2
+
+    @property
+    def total_profit(self):
+        return from_cents(self.total_cents)
+
+    def chart_xy(self):
+        """Play numbers and cumulative profit of the downsampled chart"""
+        x = np.arange(1, len(self.chart) + 1) * self.chart_stride
+        return x, np.array(self.chart)
+
+    def to_dict(self):
+        x, y = self.chart_xy()
+        return {
+            "plays": self.plays,
+            "wins": self.wins,
+            "total_profit": self.total_profit,
+            "last_outcome": colors[self.last_outcome] if self.last_outcome is not None else None,
+            "last_profit": self.last_profit,
+            "chart_stride": self.chart_stride,
+            "chart_x": x,
+            "chart_y": y,
+        }
+
+
+class RollLog:
+    def __init__(self, path=None, batch_size=256, flush_interval=2.0, cached_summaries=CACHED_SUMMARIES):
+        self.path = path or DEFAULT_PATH
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.cached_summaries = cached_summaries
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+        self._lock = threading.Lock()
+        self._pending = []
+        self._summaries = OrderedDict()  # session -> SessionSummary, least recently used first
+        self._dirty = set()
+        self._last_flush = time.monotonic()
+        self._timer = None  # pending timed flush, if any
+        atexit.register(self.close)
+
+    def _summary(self, session):
+        summary = self._summaries.get(session)
+        if summary is None:
+            summary = self._read_summary(session) or SessionSummary()
+            self._summaries[session] = summary
+        else:
+            self._summaries.move_to_end(session)
+        return summary
+
+    def _read_summary(self, session):
+        row = self._conn.execute(
+            "SELECT plays, wins, total_profit, last_outcome, last_profit, chart_stride, chart "
+            "FROM sessions WHERE session = ?", (session,)
+        ).fetchone()
+        if row is None:
+            return None
+        plays, wins, total, last_outcome, last_profit, stride, chart = row
+        return SessionSummary(plays, wins, total, last_outcome, last_profit, stride,
+                              np.frombuffer(chart, dtype=np.float64).tolist())
+
+    def record(self, session, mode, difficulty, bet, outcome, profit):
+        """Buffer one roll; outcome is a color name"""
+        self.record_many(session, mode, difficulty, bet, [outcome], [profit])
+
+    def record_many(self, session, mode, difficulty, bet, outcomes, profits):
+        """Buffer a batch of rolls (e.g. an auto-roll) from one session"""
+        now = time.time()
+        with self._lock:
+            summary = self._summary(session)
+            for outcome, profit in zip(outcomes, profits):
+                idx = colors.index(outcome)
+                profit = float(profit)
+                summary.add(idx, profit)
+                self._pending.append((session, summary.plays, now, mode, difficulty, float(bet), idx, profit))
+            self._dirty.add(session)
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+            if len(self._pending) >= self.batch_size or due:
+                self._flush_locked()
+            elif self._timer is None:
+                # An idle session's last rolls must not wait for the next one
+                wait = self.flush_interval - (time.monotonic() - self._last_flush)
+                self._timer = threading.Timer(max(wait, 0.0), self._timed_flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _timed_flush(self):
+        with self._lock:
+            self._timer = None
+            self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        self._last_flush = time.monotonic()
+        if self._conn is None or (not self._pending and not self._dirty):
+            return
+        now = time.time()
+        summaries = []
+        for session in self._dirty:
+            s = self._summaries[session]
+            summaries.append((session, now, s.plays, s.wins, s.total_profit, s.last_outcome, s.last_profit,
+                              s.chart_stride, np.array(s.chart, dtype=np.float64).tobytes()))
+        with self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.executemany("INSERT OR REPLACE INTO rolls VALUES (?, ?, ?, ?, ?, ?, ?, ?)", self._pending)
+            self._conn.executemany("INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", summaries)
+        self._pending = []
+        self._dirty = set()
+        # Everything is on disk now, so the least recently used summaries can go
+        while len(self._summaries) > self.cached_summaries:
+            self._summaries.popitem(last=False)
+
+    def load_session(self, session):
+        """Summary of a session (totals and downsampled chart), or None if unknown"""
+        with self._lock:
+            summary = self._summaries.get(session) or self._read_summary(session)
+        return summary.to_dict() if summary is not None else None
+
+    def latest_session(self, prefix=""):
+        """Most recently updated session whose id starts with prefix"""
+        with self._lock:
+            self._flush_locked()
+            row = self._conn.execute(
+                "SELECT session FROM sessions WHERE session LIKE ? ORDER BY updated DESC LIMIT 1",
+                (prefix + "%",)
+            ).fetchone()
+        return row[0] if row else None
+
+    def rolls(self, session):
+        """Full roll history of a session as (outcome names, profits)"""
+        with self._lock:
+            self._flush_locked()
+            rows = self._conn.execute(
+                "SELECT outcome, profit FROM rolls WHERE session = ? ORDER BY seq", (session,)
+            ).fetchall()
+        return [colors[r[0]] for r in rows], np.array([r[1] for r in rows])
+
+    def close(self):
+        with self._lock:
+            if self._conn is None:
+                return
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._flush_locked()
+            self._conn.close()
+            self._conn = None
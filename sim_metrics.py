@@ -0,0 +1,318 @@
+import math
+
+import numpy as np
+
+from accounting import Ledger, from_cents, profits_cents, to_cents, win_cents
+from counter_rng import generator_at, new_seed, play_outcomes, spot_check
+from game_config import colors
+from result_store import ResultStore, unpack_wins
+
+# Streaming risk metrics for Monte Carlo runs
+# - Fed one chunk of per-play profits (integer cents) at a time, never needs
+#   the full path; sums stay exact however the run is chunked and amounts
+#   are converted to dollars only in the summaries
+# - Chunks are read as given (int32 from accounting.profits_cents) and
+#   accumulated into int64, never copied into a wider array first
+# - Tracks running-max drawdown, longest losing streak (run-length encoded
+#   across chunk boundaries), first passage below a ruin level, cumulative
+#   profit at checkpoints and quantiles of per-session (block) profit
+# - Convergence: the running mean per play with a normal confidence band,
+#   sampled at log-spaced plays, so the output has a fixed size however long
+#   the run is
+# - Path sketch: what the charts need instead of the full path, i.e. counts
+#   of each per-play profit and the cumulative profit at evenly spaced plays
+# - simulate_run: the one engine behind the CLI and the app — result store
+#   lookup, the chunked draw feeding every tracker, and the store write —
+#   so both entry points always agree on what a stored run holds
+
+DEFAULT_QUANTILES = (0.05, 0.5, 0.95)
+CONVERGENCE_POINTS = 60
+CONVERGENCE_Z = 1.96  # 95% band
+PATH_POINTS = 10_000  # cumulative points kept; shorter runs keep every play
+SIM_CHUNK_SIZE = 1_000_000  # plays drawn per vectorized batch; a multiple of 8 so win bits pack per chunk
+SQUARE_BLOCK = 1 << 14  # plays squared at a time, so the float64 scratch stays in cache
+
+
+def default_checkpoints(plays):
+    """Powers of ten below plays, plus the final play"""
+    checkpoints = []
+    n = 10
+    while n < plays:
+        checkpoints.append(n)
+        n *= 10
+    checkpoints.append(plays)
+    return checkpoints
+
+
+def log_checkpoints(plays, points=CONVERGENCE_POINTS, first=100):
+    """About `points` log-spaced plays from `first` up to and including plays"""
+    first = min(first, plays)
+    return np.unique(np.geomspace(first, plays, points).round().astype(np.int64)).tolist()
+
+
+class RiskTracker:
+    def __init__(self, ruin_level=None, checkpoints=(), block_size=100, quantiles=DEFAULT_QUANTILES):
+        self.ruin_level = ruin_level
+        self.checkpoints = sorted(checkpoints)
+        self.block_size = block_size
+        self.quantiles = quantiles
+
+        self.plays = 0
+        self.cumulative = 0  # cents, like every amount below
+        self.peak = 0
+        self.max_drawdown = 0
+        self.current_streak = 0
+        self.longest_streak = 0
+        self.ruin_play = None
+        self.checkpoint_values = {}
+
+        # Per-block profit counts; block profits take few distinct values
+        # (one per possible number of wins), so this stays tiny
+        self._block_sum = 0
+        self._block_fill = 0
+        self._block_counts = {}
+
+    def update(self, profits):
+        """Consume the next chunk of per-play profits in cents"""
+        profits = np.asarray(profits)
+        n = profits.size
+        if n == 0:
+            return
+
+        cum = self.cumulative + np.cumsum(profits, dtype=np.int64)
+
+        # Drawdown from the running maximum (the path starts at 0)
+        peak = np.maximum(self.peak, np.maximum.accumulate(cum))
+        self.max_drawdown = max(self.max_drawdown, int((peak - cum).max()))
+        self.peak = int(peak[-1])
+
+        # Losing streaks: gaps between non-losing plays
+        non_loss = np.flatnonzero(profits >= 0)
+        if non_loss.size == 0:
+            self.current_streak += n
+            self.longest_streak = max(self.longest_streak, self.current_streak)
+        else:
+            runs = [self.current_streak + non_loss[0], n - non_loss[-1] - 1]
+            if non_loss.size > 1:
+                runs.append(int((np.diff(non_loss) - 1).max()))
+            self.longest_streak = max(self.longest_streak, int(max(runs)))
+            self.current_streak = int(n - non_loss[-1] - 1)
+
+        # First passage below the ruin level
+        if self.ruin_level is not None and self.ruin_play is None:
+            hit = np.flatnonzero(cum <= -to_cents(self.ruin_level))
+            if hit.size:
+                self.ruin_play = self.plays + int(hit[0]) + 1
+
+        for cp in self.checkpoints:
+            if self.plays < cp <= self.plays + n:
+                self.checkpoint_values[cp] = int(cum[cp - self.plays - 1])
+
+        self._update_blocks(profits)
+
+        self.plays += n
+        self.cumulative = int(cum[-1])
+
+    def _update_blocks(self, profits):
+        # Finish the block carried over from the previous chunk
+        take = min(self.block_size - self._block_fill, profits.size)
+        self._block_sum += int(profits[:take].sum(dtype=np.int64))
+        self._block_fill += take
+        if self._block_fill == self.block_size:
+            self._count_blocks(np.array([self._block_sum]))
+            self._block_sum = 0
+            self._block_fill = 0
+        rest = profits[take:]
+        if rest.size == 0:
+            return
+
+        full = rest.size // self.block_size * self.block_size
+        if full:
+            self._count_blocks(rest[:full].reshape(-1, self.block_size).sum(axis=1, dtype=np.int64))
+        self._block_sum = int(rest[full:].sum(dtype=np.int64))
+        self._block_fill = rest.size - full
+
+    def _count_blocks(self, block_profits):
+        values, counts = np.unique(block_profits, return_counts=True)
+        for value, count in zip(values.tolist(), counts.tolist()):
+            self._block_counts[value] = self._block_counts.get(value, 0) + count
+
+    def block_quantiles(self):
+        """Quantiles of profit (dollars) over complete blocks of block_size plays"""
+        if not self._block_counts:
+            return {q: None for q in self.quantiles}
+        values = np.array(sorted(self._block_counts))
+        cdf = np.cumsum([self._block_counts[v] for v in values])
+        cdf = cdf / cdf[-1]
+        return {q: from_cents(int(values[np.searchsorted(cdf, q)])) for q in self.quantiles}
+
+    def summary(self):
+        """Metrics in dollars"""
+        return {
+            "max_drawdown": from_cents(self.max_drawdown),
+            "longest_losing_streak": self.longest_streak,
+            "ruin_level": self.ruin_level,
+            "ruin_play": self.ruin_play,
+            "checkpoints": {cp: from_cents(v) for cp, v in self.checkpoint_values.items()},
+            "block_size": self.block_size,
+            "block_quantiles": self.block_quantiles(),
+        }
+
+
+class ConvergenceTracker:
+    """Running mean of per-play profit with a confidence band at fixed checkpoints"""
+
+    def __init__(self, checkpoints, z=CONVERGENCE_Z):
+        self.checkpoints = np.array(sorted(checkpoints), dtype=np.int64)
+        self.z = z
+
+        self.plays = 0
+        self.total = 0  # cents
+        self.total_sq = 0.0  # cents^2
+        self.means = []  # dollars per play
+        self.half_widths = []
+
+    def update(self, profits):
+        """Consume the next chunk of per-play profits in cents"""
+        profits = np.asarray(profits)
+        n = profits.size
+        if n == 0:
+            return
+
+        # Checkpoints that fall in this chunk, as offsets into it; sums are
+        # taken segment by segment up to each one, so no running-sum or
+        # squared copy of the chunk is made
+        lo, hi = np.searchsorted(self.checkpoints, [self.plays + 1, self.plays + n + 1])
+        done = 0
+        for cp in self.checkpoints[lo:hi].tolist():
+            end = cp - self.plays
+            self._add(profits[done:end])
+            done = end
+            mean = self.total / cp
+            se = math.sqrt(max(self.total_sq / cp - mean ** 2, 0.0) / cp)
+            self.means.append(from_cents(mean))
+            self.half_widths.append(from_cents(self.z * se))
+        self._add(profits[done:])
+        self.plays += n
+
+    def _add(self, profits):
+        self.total += int(profits.sum(dtype=np.int64))
+        for start in range(0, profits.size, SQUARE_BLOCK):
+            block = profits[start:start + SQUARE_BLOCK].astype(np.float64)
+            self.total_sq += float(block @ block)
+
+    def summary(self):
+        done = len(self.means)
+        return {
+            "plays": self.checkpoints[:done].tolist(),
+            "mean": list(self.means),
+            "half_width": list(self.half_widths),
+            "z": self.z,
+        }
+
+
+class PathSketch:
+    """Fixed-size stand-in for a run's profit path, for its charts.
+
+    Counts every distinct per-play profit (a bet only ever wins or loses a
+    fixed amount), so the histogram is exact, and keeps the cumulative
+    profit after every stride-th play plus the last one, with the stride
+    chosen up front so no more than `points` are kept.
+    """
+
+    def __init__(self, plays, points=PATH_POINTS):
+        self.stride = max(-(-plays // points), 1)
+        self.plays = 0
+        self.cumulative = 0  # cents
+        self.counts = {}  # profit (cents) -> plays
+        self._x = []
+        self._y = []
+
+    def update(self, profits):
+        """Consume the next chunk of per-play profits in cents"""
+        profits = np.asarray(profits)
+        n = profits.size
+        if n == 0:
+            return
+
+        # Offsets of the plays whose (1-based) number is a multiple of the stride,
+        # and the cumulative profit there from the sums between them
+        idx = np.arange((self.stride - 1 - self.plays) % self.stride, n, self.stride)
+        starts = np.concatenate([[0], idx + 1])
+        cum = self.cumulative + np.cumsum(np.add.reduceat(profits, starts[starts < n], dtype=np.int64))
+        self._x.append(self.plays + idx + 1)
+        self._y.append(cum[:idx.size])
+
+        values, counts = np.unique(profits, return_counts=True)
+        for value, count in zip(values.tolist(), counts.tolist()):
+            self.counts[value] = self.counts.get(value, 0) + count
+
+        self.plays += n
+        self.cumulative = int(cum[-1])
+
+    def summary(self):
+        """Histogram values/counts and cumulative x/y, in dollars"""
+        x = np.concatenate(self._x) if self._x else np.zeros(0, dtype=np.int64)
+        y = np.concatenate(self._y) if self._y else np.zeros(0, dtype=np.int64)
+        if self.plays and (x.size == 0 or x[-1] != self.plays):
+            x = np.append(x, self.plays)
+            y = np.append(y, self.cumulative)
+        values = sorted(self.counts)
+        return {
+            "stride": self.stride,
+            "values": [from_cents(v) for v in values],
+            "counts": [self.counts[v] for v in values],
+            "x": x.tolist(),
+            "y": from_cents(y).tolist(),
+        }
+
+
+def simulate_run(probs, payout_net, bet, plays, ruin_level, seed=None, store=None, on_chunk=None):
+    """Stream one Monte Carlo run of bets on Red; returns (stats, seed, cached).
+
+    An unseeded run draws a fresh seed, returned so it can be reproduced.
+    A seeded run is looked up in store (if given) first, spot-checking the
+    stored plays against the generator, and saved there when computed.
+    on_chunk(start, profits) sees every chunk of per-play profits (cents)
+    in order, replayed from the stored win bits on a hit, e.g. to write a
+    per-play CSV.
+    """
+    chosen_idx = colors.index("Red")
+    store_key = None
+    if seed is None:
+        seed = new_seed()
+    elif store is not None:
+        store_key = ResultStore.key(probs=probs, payout=payout_net, bet=bet, plays=plays, seed=seed, ruin_level=ruin_level)
+        cached = store.get(store_key, verify=lambda packed: spot_check(packed, plays, probs, chosen_idx, seed))
+        if cached is not None:
+            # The stored stats include the chart data; plays are only unpacked for on_chunk
+            if on_chunk is not None:
+                for start in range(0, plays, SIM_CHUNK_SIZE):
+                    wins = unpack_wins(cached["packed_wins"], start, min(SIM_CHUNK_SIZE, plays - start))
+                    on_chunk(start, profits_cents(wins, bet, payout_net))
+            return cached["stats"], seed, True
+
+    bet_c, win_c = to_cents(bet), win_cents(bet, payout_net)
+    gen = generator_at(seed)
+    risk = RiskTracker(ruin_level=ruin_level, checkpoints=default_checkpoints(plays))
+    convergence = ConvergenceTracker(log_checkpoints(plays))
+    path = PathSketch(plays)
+    ledger = Ledger()  # exact totals in integer cents
+    packed = []  # win bits for the result store
+    for start in range(0, plays, SIM_CHUNK_SIZE):
+        outcomes = play_outcomes(probs, seed, start, min(SIM_CHUNK_SIZE, plays - start), gen)
+        wins = outcomes == chosen_idx
+        chunk = profits_cents(wins, bet, payout_net)
+        ledger.add(wins, win_c, bet_c)
+        risk.update(chunk)
+        convergence.update(chunk)
+        path.update(chunk)
+        if on_chunk is not None:
+            on_chunk(start, chunk)
+        if store_key is not None:
+            packed.append(np.packbits(wins))
+
+    stats = {**ledger.summary(bet), "risk": risk.summary(), "convergence": convergence.summary(), "path": path.summary()}
+    if store_key is not None:
+        store.put(store_key, np.concatenate(packed), stats)
+    return stats, seed, False
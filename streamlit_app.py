@@ -2,8 +2,19 @@ import streamlit as st
 import numpy as np
 import matplotlib.pyplot as plt
 import pandas as pd
+import hmac
+import os
 import time
 import random
+import uuid
+
+from accounting import from_cents, profits_cents, to_cents, win_cents
+from figure_cache import FigureCache
+from game_config import colors, fair_probabilities, DIFFICULTY_LEVELS
+from house_analytics import HouseAnalytics
+from result_store import ResultStore
+from roll_log import RollLog, SessionSummary
+from sim_metrics import simulate_run
 
 # DICE-EM! - Stochastic Game Simulation
 # A Boston mafia-style color dice game with sinister tweaks
@@ -11,34 +22,6 @@ import random
 
 st.set_page_config(page_title="DICE-EM!", page_icon="🎲", layout="wide")
 
-# Game configuration
-colors = ["Red", "Blue", "Yellow", "Green", "White", "Purple"]
-fair_probabilities = [1/6] * 6
-
-# Difficulty levels for tweaked game
-DIFFICULTY_LEVELS = {
-    "Slightly Rigged": {
-        "probabilities": [0.14, 0.172, 0.172, 0.172, 0.172, 0.172],
-        "payout_multiplier": 4.9,
-        "description": "Barely noticeable... or is it?"
-    },
-    "Moderately Unfair": {
-        "probabilities": [0.12, 0.176, 0.176, 0.176, 0.176, 0.176],
-        "payout_multiplier": 4.5,
-        "description": "The house is smilin' now"
-    },
-    "Heavily Stacked": {
-        "probabilities": [0.10, 0.18, 0.18, 0.18, 0.18, 0.18],
-        "payout_multiplier": 4.0,
-        "description": "You're gonna lose, pal"
-    },
-    "Almost Impossible": {
-        "probabilities": [0.05, 0.19, 0.19, 0.19, 0.19, 0.19],
-        "payout_multiplier": 3.5,
-        "description": "Don't even bother tryin'"
-    }
-}
-
 # Boston mafia-style captions
 MAFIA_CAPTIONS = [
     "Try your luck, you won't have one.",
@@ -200,15 +183,63 @@ def load_custom_css(mode, difficulty=None):
         """, unsafe_allow_html=True)
 
 
+@st.cache_resource
+def get_roll_log():
+    """Process-wide persistent roll log, shared by all sessions"""
+    return RollLog()
+
+def start_log_session():
+    """Start a fresh logged session and put its id in the URL"""
+    st.session_state.log_session = uuid.uuid4().hex
+    st.session_state.live_chart = SessionSummary()
+    st.query_params["session"] = st.session_state.log_session
+
+@st.cache_resource
+def get_house_analytics():
+    """Process-wide live house take, fed by every session's rolls"""
+    return HouseAnalytics()
+
+def admin_token():
+    """Secret that unlocks the house analytics (st.secrets or DICE_ADMIN_TOKEN), None if unset"""
+    try:
+        token = st.secrets.get("admin_token")
+    except FileNotFoundError:
+        token = None
+    return token or os.environ.get("DICE_ADMIN_TOKEN") or None
+
+def is_admin():
+    """?admin=<token> matches the configured secret; nobody is admin without one"""
+    token = admin_token()
+    given = st.query_params.get("admin", "")
+    return bool(token) and hmac.compare_digest(given.encode(), str(token).encode())
+
+@st.fragment(run_every=5)
+def admin_panel():
+    """Live house take across all sessions (open the app with ?admin=<token>)"""
+    snapshot = get_house_analytics().snapshot()
+    st.header("🏦 House Analytics")
+    st.caption(f"All sessions on this server · up {snapshot['uptime_seconds'] / 60:.0f} min · refreshes every 5 s")
+    columns = {"mode": "Mode", "difficulty": "Difficulty", "plays": "Plays", "wins": "Wins",
+               "wagered": "Wagered ($)", "house_take": "House Take ($)", "house_edge": "House Edge"}
+    for name, rows in [*snapshot["windows"].items(), ("Since start", snapshot["lifetime"])]:
+        st.markdown(f"#### {name}")
+        if rows:
+            st.dataframe(pd.DataFrame(rows).rename(columns=columns), hide_index=True, use_container_width=True)
+        else:
+            st.info("No rolls yet.")
+    st.download_button("⬇️ Download JSON", get_house_analytics().to_json(), "house_analytics.json", "application/json")
+    if st.query_params.get("format") == "json":
+        st.json(snapshot)
+
+if is_admin():
+    admin_panel()
+    st.stop()
+
 # Initialize session state
 if 'total_profit' not in st.session_state:
     st.session_state.total_profit = 0.0
 if 'plays' not in st.session_state:
     st.session_state.plays = 0
-if 'history' not in st.session_state:
-    st.session_state.history = []
-if 'outcome_history' not in st.session_state:
-    st.session_state.outcome_history = []
 if 'last_outcome' not in st.session_state:
     st.session_state.last_outcome = None
 if 'last_profit' not in st.session_state:
@@ -220,9 +251,42 @@ if 'dice_animation' not in st.session_state:
 if 'animation_frames' not in st.session_state:
     st.session_state.animation_frames = []
 
+# Reconnecting sessions (same ?session= in the URL) get their totals and a
+# downsampled chart back from the roll log's summary row, without replaying rolls
+if 'log_session' not in st.session_state:
+    summary = None
+    if "session" in st.query_params:
+        summary = get_roll_log().load_session(st.query_params["session"])
+    if summary is None:
+        start_log_session()
+    else:
+        st.session_state.log_session = st.query_params["session"]
+        st.session_state.live_chart = SessionSummary(
+            summary["plays"], summary["wins"], summary["total_profit"],
+            chart_stride=summary["chart_stride"], chart=summary["chart_y"],
+        )
+        st.session_state.total_profit = summary["total_profit"]
+        st.session_state.plays = summary["plays"]
+        st.session_state.last_outcome = summary["last_outcome"]
+        st.session_state.last_profit = summary["last_profit"]
+
 # Simulation functions
-def simulate_game(mode, plays=20000, bet=1.0, difficulty="Slightly Rigged"):
-    """Run Monte Carlo simulation"""
+@st.cache_resource
+def get_result_store():
+    """On-disk simulation result store, shared with the CLI"""
+    return ResultStore()
+
+def simulate_game(mode, plays=20000, bet=1.0, difficulty="Slightly Rigged", ruin_level=None, seed=None):
+    """Run Monte Carlo simulation
+
+    Plays are drawn in chunks; risk metrics, the running-mean convergence
+    series and the chart data (path sketch) are streamed chunk by chunk, so
+    the full path is never kept.
+    ruin_level is the loss that counts as going broke (default: 100 bets).
+    Seeded runs are looked up in, and saved to, the shared result store.
+    Draws come from a counter-based generator, so unseeded runs get a fresh
+    seed that is returned with the results and reproduces them.
+    """
     chosen_color = "Red"
     chosen_idx = colors.index(chosen_color)
     p_fair = np.array([1/6.0] * 6)
@@ -237,48 +301,52 @@ def simulate_game(mode, plays=20000, bet=1.0, difficulty="Slightly Rigged"):
     else:
         raise ValueError("Unknown mode")
     
-    outcomes = np.random.choice(len(probs), size=plays, p=probs)
-    wins = outcomes == chosen_idx
-    profits = np.where(wins, payout_net * bet, -bet)
-    
-    total = profits.sum()
-    mean = profits.mean()
-    std = profits.std()
-    win_rate = (profits > 0).mean()
-    house_edge = -mean / bet
-    
-    return {
-        "mode": mode,
-        "difficulty": difficulty if mode == "tweaked" else "N/A",
-        "plays": plays,
-        "bet": bet,
-        "profits": profits,
-        "total": float(total),
-        "mean": float(mean),
-        "std": float(std),
-        "win_rate": float(win_rate),
-        "house_edge": float(house_edge),
-    }
+    if ruin_level is None:
+        ruin_level = 100 * bet
+    
+    stats, seed, _ = simulate_run(probs, payout_net, bet, plays, ruin_level, seed=seed, store=get_result_store())
+    return {"mode": mode, "difficulty": difficulty if mode == "tweaked" else "N/A", **stats, "seed": seed}
+
+@st.cache_resource
+def get_figure_cache():
+    """Process-wide cache of rendered simulation charts, shared by all sessions"""
+    return FigureCache()
 
 def play_round(mode, bet_amount, difficulty="Slightly Rigged"):
     """Play one round and return outcome and profit"""
     if mode == "Fair":
         probs = fair_probabilities
-        payout_multiplier = 5.0
+        payout_net = 5.0
     else:
         difficulty_config = DIFFICULTY_LEVELS[difficulty]
         probs = difficulty_config["probabilities"]
-        payout_multiplier = difficulty_config["payout_multiplier"]
+        payout_net = difficulty_config["payout_multiplier"]  # net, like simulate_game
     
     outcome = np.random.choice(colors, p=probs)
     
     if outcome == "Red":
-        profit = bet_amount * payout_multiplier - bet_amount
+        profit = from_cents(win_cents(bet_amount, payout_net))
     else:
-        profit = -bet_amount
+        profit = from_cents(-to_cents(bet_amount))
     
     return outcome, profit
 
+def play_rounds(mode, bet_amount, rounds, difficulty="Slightly Rigged"):
+    """Play many rounds in one vectorized draw; returns outcome names and profits"""
+    if mode == "Fair":
+        probs = fair_probabilities
+        payout_net = 5.0
+    else:
+        difficulty_config = DIFFICULTY_LEVELS[difficulty]
+        probs = difficulty_config["probabilities"]
+        payout_net = difficulty_config["payout_multiplier"]  # net, like simulate_game
+    
+    outcome_idx = np.random.choice(len(colors), size=rounds, p=probs)
+    wins = outcome_idx == colors.index("Red")
+    profits = from_cents(profits_cents(wins, bet_amount, payout_net))
+    
+    return [colors[i] for i in outcome_idx], profits
+
 def animate_dice(mode, placeholder, num_spins=15):
     """Animate dice rolling"""
     spin_delay = 0.05 if mode == "Fair" else 0.08
@@ -309,6 +377,98 @@ def animate_dice(mode, placeholder, num_spins=15):
     
     return True
 
+def build_distribution_figure(fair, tweaked, play_mode):
+    """Side-by-side profit histograms for the fair and tweaked runs"""
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
+    fig.patch.set_facecolor('#1a1a2e' if play_mode == "Tweaked" else '#f0f2f6')
+    
+    # Fair game histogram
+    # Weighted by the exact per-profit counts: the same bars as the full path
+    ax1.hist(fair['path']['values'], bins=40, weights=fair['path']['counts'], alpha=0.8, color='#10b981', edgecolor='black')
+    ax1.set_title("Fair Game - Profit Distribution", fontsize=14, color='white' if play_mode == "Tweaked" else 'black')
+    ax1.set_xlabel("Profit per Play ($)", fontsize=11, color='white' if play_mode == "Tweaked" else 'black')
+    ax1.set_ylabel("Frequency", fontsize=11, color='white' if play_mode == "Tweaked" else 'black')
+    ax1.axvline(fair['mean'], color='darkgreen', linestyle='--', linewidth=2, label=f"Mean: ${fair['mean']:.4f}")
+    ax1.legend()
+    ax1.set_facecolor('#16213e' if play_mode == "Tweaked" else 'white')
+    ax1.tick_params(colors='white' if play_mode == "Tweaked" else 'black')
+    ax1.grid(alpha=0.3, color='white' if play_mode == "Tweaked" else 'gray')
+    
+    # Tweaked game histogram
+    ax2.hist(tweaked['path']['values'], bins=40, weights=tweaked['path']['counts'], alpha=0.8, color='#e74c3c', edgecolor='black')
+    ax2.set_title("Tweaked Game - Profit Distribution", fontsize=14, color='white' if play_mode == "Tweaked" else 'black')
+    ax2.set_xlabel("Profit per Play ($)", fontsize=11, color='white' if play_mode == "Tweaked" else 'black')
+    ax2.set_ylabel("Frequency", fontsize=11, color='white' if play_mode == "Tweaked" else 'black')
+    ax2.axvline(tweaked['mean'], color='darkred', linestyle='--', linewidth=2, label=f"Mean: ${tweaked['mean']:.4f}")
+    ax2.legend()
+    ax2.set_facecolor('#16213e' if play_mode == "Tweaked" else 'white')
+    ax2.tick_params(colors='white' if play_mode == "Tweaked" else 'black')
+    ax2.grid(alpha=0.3, color='white' if play_mode == "Tweaked" else 'gray')
+    
+    plt.tight_layout()
+    return fig
+
+def build_cumulative_figure(fair, tweaked, play_mode):
+    """Cumulative profit of the fair and tweaked runs on one axis"""
+    fig, ax = plt.subplots(figsize=(14, 6))
+    fig.patch.set_facecolor('#1a1a2e' if play_mode == "Tweaked" else '#f0f2f6')
+    
+    ax.plot(fair['path']['x'], fair['path']['y'], label='Fair Game', linewidth=2.5, color='#10b981', alpha=0.9)
+    ax.plot(tweaked['path']['x'], tweaked['path']['y'], label='Tweaked Game', linewidth=2.5, color='#e74c3c', alpha=0.9)
+    ax.axhline(y=0, color='white' if play_mode == "Tweaked" else 'gray', linestyle='--', alpha=0.7)
+    ax.set_title("Cumulative Profit Over Time", fontsize=16, color='white' if play_mode == "Tweaked" else 'black')
+    ax.set_xlabel("Play Number", fontsize=12, color='white' if play_mode == "Tweaked" else 'black')
+    ax.set_ylabel("Total Profit ($)", fontsize=12, color='white' if play_mode == "Tweaked" else 'black')
+    ax.legend(fontsize=12)
+    ax.set_facecolor('#16213e' if play_mode == "Tweaked" else 'white')
+    ax.tick_params(colors='white' if play_mode == "Tweaked" else 'black')
+    ax.grid(alpha=0.3, color='white' if play_mode == "Tweaked" else 'gray')
+    
+    plt.tight_layout()
+    return fig
+
+
+def build_convergence_figure(fair, tweaked, play_mode):
+    """Running house edge of both runs with confidence bands, on log-spaced plays"""
+    fig, ax = plt.subplots(figsize=(14, 5))
+    fig.patch.set_facecolor('#1a1a2e' if play_mode == "Tweaked" else '#f0f2f6')
+    text_color = 'white' if play_mode == "Tweaked" else 'black'
+    
+    level = DIFFICULTY_LEVELS[tweaked['difficulty']]
+    red = colors.index("Red")
+    exact_tweaked = 1 - level["probabilities"][red] * (1 + level["payout_multiplier"])
+    
+    for sim, label, color, exact in ((fair, 'Fair Game', '#10b981', 0.0),
+                                     (tweaked, 'Tweaked Game', '#e74c3c', exact_tweaked)):
+        conv = sim['convergence']
+        plays = np.array(conv['plays'])
+        edge = -np.array(conv['mean']) / sim['bet'] * 100
+        band = np.array(conv['half_width']) / sim['bet'] * 100
+        ax.fill_between(plays, edge - band, edge + band, color=color, alpha=0.2)
+        ax.plot(plays, edge, label=label, linewidth=2.5, color=color, alpha=0.9)
+        ax.axhline(y=exact * 100, color=color, linestyle='--', alpha=0.7)
+    
+    ax.set_xscale('log')
+    ax.set_title(f"House Edge Convergence (bands: ±{fair['convergence']['z']:g} SE, dashed: exact edge)",
+                 fontsize=16, color=text_color)
+    ax.set_xlabel("Plays", fontsize=12, color=text_color)
+    ax.set_ylabel("Running House Edge (%)", fontsize=12, color=text_color)
+    ax.legend(fontsize=12)
+    ax.set_facecolor('#16213e' if play_mode == "Tweaked" else 'white')
+    ax.tick_params(colors=text_color)
+    ax.grid(alpha=0.3, color='white' if play_mode == "Tweaked" else 'gray')
+    
+    plt.tight_layout()
+    return fig
+
+
+def risk_column(risk):
+    """Format a RiskTracker summary as one column of the risk table"""
+    ruin = f"{risk['ruin_play']:,}" if risk['ruin_play'] is not None else "Never"
+    quantiles = [f"{v:.2f}" if v is not None else "-" for v in risk['block_quantiles'].values()]
+    checkpoints = [f"{v:.2f}" for v in risk['checkpoints'].values()]
+    return [f"{risk['max_drawdown']:.2f}", f"{risk['longest_losing_streak']:,}", ruin] + quantiles + checkpoints
+
 # Title and caption
 st.markdown(f"""
     <h1 style='text-align: center; font-size: 72px; margin-bottom: 0;'>
@@ -381,10 +541,15 @@ with st.sidebar:
     st.markdown("---")
     st.caption("© 2025 DICE-EM! | Perya Simulation")
 
-tab1, tab2, tab3 = st.tabs(["🎮 Play Now", "📊 Run Simulation", "ℹ️ About"])
+LIVE_CHART_POINTS = 256  # max points sent for the live cumulative profit chart
+
+# Each tab body is a fragment so that interacting with one panel (e.g. rolling
+# the dice) only reruns that panel instead of the whole script.
 
 # Tab 1: Interactive Play
-with tab1:
+@st.fragment
+def play_panel(play_mode, bet_amount, difficulty):
+    """Dice roll area and live session stats"""
     col_left, col_right = st.columns([3, 2])
     
     with col_left:
@@ -394,6 +559,57 @@ with tab1:
         dice_placeholder = st.empty()
         result_placeholder = st.empty()
         
+        # Action buttons
+        col_btn1, col_btn2 = st.columns(2)
+        
+        with col_btn1:
+            if st.button("🎲 ROLL THE DICE", type="primary", use_container_width=True):
+                # Animate dice
+                animate_dice(play_mode, dice_placeholder, num_spins=15 if play_mode == "Fair" else 20)
+                
+                # Play round
+                outcome, profit = play_round(play_mode, bet_amount, difficulty if difficulty else "Slightly Rigged")
+                st.session_state.last_outcome = outcome
+                st.session_state.last_profit = profit
+                st.session_state.plays += 1
+                st.session_state.live_chart.add(colors.index(outcome), profit)
+                # The summary keeps the total in integer cents, so it never drifts
+                st.session_state.total_profit = st.session_state.live_chart.total_profit
+                get_roll_log().record(st.session_state.log_session, play_mode, difficulty, bet_amount, outcome, profit)
+                get_house_analytics().record(play_mode, difficulty, bet_amount, profit)
+        
+        with col_btn2:
+            if st.button("🔄 Reset Game", use_container_width=True):
+                st.session_state.total_profit = 0.0
+                st.session_state.plays = 0
+                st.session_state.last_outcome = None
+                st.session_state.last_profit = None
+                st.session_state.mafia_caption = random.choice(MAFIA_CAPTIONS)
+                start_log_session()
+                # Full rerun: the caption lives in the page header, outside this fragment
+                st.rerun()
+        
+        # Auto-roll: many rounds in one rerun, no animation, one final frame
+        col_auto1, col_auto2 = st.columns(2)
+        
+        with col_auto1:
+            auto_rounds = st.number_input("Auto-roll rounds:", min_value=10, max_value=100000, value=1000, step=100)
+        
+        with col_auto2:
+            st.write("")
+            if st.button("⚡ AUTO-ROLL", use_container_width=True):
+                outcomes, profits = play_rounds(play_mode, bet_amount, int(auto_rounds), difficulty if difficulty else "Slightly Rigged")
+                st.session_state.last_outcome = outcomes[-1]
+                st.session_state.last_profit = float(profits[-1])
+                st.session_state.plays += len(outcomes)
+                live_chart = st.session_state.live_chart
+                for outcome, profit in zip(outcomes, profits.tolist()):
+                    live_chart.add(colors.index(outcome), profit)
+                st.session_state.total_profit = live_chart.total_profit
+                get_roll_log().record_many(st.session_state.log_session, play_mode, difficulty, bet_amount, outcomes, profits)
+                get_house_analytics().record_many(play_mode, difficulty, bet_amount, profits)
+    
+        # Drawn after the buttons so a roll shows up without another rerun
         if st.session_state.last_outcome:
             outcome = st.session_state.last_outcome
             idx = colors.index(outcome)
@@ -430,35 +646,6 @@ with tab1:
                     </div>
                 </div>
             """, unsafe_allow_html=True)
-        
-        # Action buttons
-        col_btn1, col_btn2 = st.columns(2)
-        
-        with col_btn1:
-            if st.button("🎲 ROLL THE DICE", type="primary", use_container_width=True):
-                # Animate dice
-                animate_dice(play_mode, dice_placeholder, num_spins=15 if play_mode == "Fair" else 20)
-                
-                # Play round
-                outcome, profit = play_round(play_mode, bet_amount, difficulty if difficulty else "Slightly Rigged")
-                st.session_state.last_outcome = outcome
-                st.session_state.last_profit = profit
-                st.session_state.total_profit += profit
-                st.session_state.plays += 1
-                st.session_state.history.append(profit)
-                st.session_state.outcome_history.append(outcome)
-                st.rerun()
-        
-        with col_btn2:
-            if st.button("🔄 Reset Game", use_container_width=True):
-                st.session_state.total_profit = 0.0
-                st.session_state.plays = 0
-                st.session_state.history = []
-                st.session_state.outcome_history = []
-                st.session_state.last_outcome = None
-                st.session_state.last_profit = None
-                st.session_state.mafia_caption = random.choice(MAFIA_CAPTIONS)
-                st.rerun()
     
     with col_right:
         st.subheader("📊 Your Stats")
@@ -472,49 +659,48 @@ with tab1:
             st.metric("Total Profit", f"${st.session_state.total_profit:.2f}", delta=profit_delta)
         
         # Show history charts
-        if len(st.session_state.history) > 1:
+        if st.session_state.plays > 1:
             st.markdown("#### 📈 Performance")
+            live_chart = st.session_state.live_chart
             
-            # Cumulative profit
-            fig, ax = plt.subplots(figsize=(6, 3))
-            cumulative = np.cumsum(st.session_state.history)
-            ax.plot(cumulative, linewidth=2, color='#e74c3c' if cumulative[-1] < 0 else '#10b981')
-            ax.axhline(y=0, color='white', linestyle='--', alpha=0.5)
-            ax.set_title("Cumulative Profit", fontsize=12, color='white')
-            ax.set_xlabel("Play Number", fontsize=10, color='white')
-            ax.set_ylabel("Total Profit ($)", fontsize=10, color='white')
-            ax.set_facecolor('#1a1a2e' if play_mode == "Tweaked" else '#667eea')
-            fig.patch.set_facecolor('none')
-            ax.tick_params(colors='white')
-            ax.spines['bottom'].set_color('white')
-            ax.spines['left'].set_color('white')
-            ax.spines['top'].set_visible(False)
-            ax.spines['right'].set_visible(False)
-            ax.grid(alpha=0.2, color='white')
-            st.pyplot(fig)
-            plt.close()
+            # Cumulative profit: a native chart over the session's stride-doubling
+            # summary, so a roll costs O(1) and the payload stays a few KB
+            play_numbers, cumulative = live_chart.chart_xy()
+            step = max(-(-len(play_numbers) // LIVE_CHART_POINTS), 1)
+            play_numbers, cumulative = play_numbers[step - 1::step], cumulative[step - 1::step]
+            if len(play_numbers) == 0 or play_numbers[-1] != live_chart.plays:
+                play_numbers = np.append(play_numbers, live_chart.plays)
+                cumulative = np.append(cumulative, live_chart.total_profit)
+            chart_data = pd.DataFrame({
+                "Play Number": np.insert(play_numbers, 0, 0).astype(np.int32),
+                "Total Profit ($)": np.insert(cumulative, 0, 0.0).astype(np.float32),
+            })
+            st.line_chart(chart_data, x="Play Number", y="Total Profit ($)", height=260,
+                          color='#e74c3c' if live_chart.total_profit < 0 else '#10b981')
             
             # Win/Loss distribution
-            wins = sum(1 for p in st.session_state.history if p > 0)
-            losses = sum(1 for p in st.session_state.history if p <= 0)
+            wins = live_chart.wins
+            losses = st.session_state.plays - wins
             
             st.markdown("#### 🎯 Win/Loss Ratio")
             col_w, col_l = st.columns(2)
             with col_w:
-                st.metric("Wins", wins, f"{wins/len(st.session_state.history)*100:.1f}%")
+                st.metric("Wins", wins, f"{wins/st.session_state.plays*100:.1f}%")
             with col_l:
-                st.metric("Losses", losses, f"{losses/len(st.session_state.history)*100:.1f}%")
+                st.metric("Losses", losses, f"{losses/st.session_state.plays*100:.1f}%")
         else:
             st.info("Roll the dice to start tracking your stats!")
 
 
 # Tab 2: Monte Carlo Simulation
-with tab2:
+@st.fragment
+def simulation_panel(play_mode):
+    """Monte Carlo settings, results and charts"""
     st.header("📊 Monte Carlo Simulation & Analysis")
     st.markdown("Run thousands of simulated plays to analyze the house edge and compare outcomes.")
     
     # Simulation settings in columns
-    col_sim1, col_sim2, col_sim3 = st.columns(3)
+    col_sim1, col_sim2, col_sim3, col_sim4 = st.columns(4)
     
     with col_sim1:
         num_plays = st.slider("Number of plays:", 1000, 100000, 20000, 1000)
@@ -525,15 +711,24 @@ with tab2:
     with col_sim3:
         sim_difficulty = st.selectbox("Tweaked Difficulty:", list(DIFFICULTY_LEVELS.keys()), index=1)
     
+    with col_sim4:
+        sim_seed = st.number_input("Seed:", min_value=0, value=None, step=1, placeholder="Random",
+                                   help="Leave empty for a fresh run each time. Same settings + same seed = same results (loaded from the result store)")
+    
     if st.button("▶️ Run Full Simulation", type="primary", use_container_width=True):
         with st.spinner("Running Monte Carlo simulations... The house is counting your money."):
-            fair_results = simulate_game("fair", plays=num_plays, bet=sim_bet)
-            tweaked_results = simulate_game("tweaked", plays=num_plays, bet=sim_bet, difficulty=sim_difficulty)
+            seed = int(sim_seed) if sim_seed is not None else None
+            fair_results = simulate_game("fair", plays=num_plays, bet=sim_bet, seed=seed)
+            tweaked_results = simulate_game("tweaked", plays=num_plays, bet=sim_bet, difficulty=sim_difficulty, seed=seed)
             
             st.session_state.fair_sim = fair_results
             st.session_state.tweaked_sim = tweaked_results
+            
+            # New results replace the old ones, so their rendered charts are stale
+            if 'sim_id' in st.session_state:
+                get_figure_cache().invalidate(st.session_state.sim_id)
+            st.session_state.sim_id = uuid.uuid4().hex
         st.success("✅ Simulation complete! Check the results below.")
-        st.rerun()
     
     if 'fair_sim' in st.session_state and 'tweaked_sim' in st.session_state:
         st.markdown("---")
@@ -556,6 +751,7 @@ with tab2:
             
             st.caption(f"Standard Deviation: ${fair['std']:.4f}")
             st.caption(f"Plays: {fair['plays']:,}")
+            st.caption(f"Seed: {fair['seed']}")
         
         with col_tweaked:
             st.markdown("### 🔴 Tweaked Game")
@@ -572,6 +768,7 @@ with tab2:
             
             st.caption(f"Standard Deviation: ${tweaked['std']:.4f}")
             st.caption(f"Difficulty: {tweaked['difficulty']}")
+            st.caption(f"Seed: {tweaked['seed']}")
         
         st.markdown("---")
         
@@ -579,53 +776,24 @@ with tab2:
         tab_hist, tab_cum, tab_compare = st.tabs(["📊 Distribution", "📈 Cumulative", "⚖️ Comparison"])
         
         with tab_hist:
-            fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
-            fig.patch.set_facecolor('#1a1a2e' if play_mode == "Tweaked" else '#f0f2f6')
-            
-            # Fair game histogram
-            ax1.hist(fair['profits'], bins=40, alpha=0.8, color='#10b981', edgecolor='black')
-            ax1.set_title("Fair Game - Profit Distribution", fontsize=14, color='white' if play_mode == "Tweaked" else 'black')
-            ax1.set_xlabel("Profit per Play ($)", fontsize=11, color='white' if play_mode == "Tweaked" else 'black')
-            ax1.set_ylabel("Frequency", fontsize=11, color='white' if play_mode == "Tweaked" else 'black')
-            ax1.axvline(fair['mean'], color='darkgreen', linestyle='--', linewidth=2, label=f"Mean: ${fair['mean']:.4f}")
-            ax1.legend()
-            ax1.set_facecolor('#16213e' if play_mode == "Tweaked" else 'white')
-            ax1.tick_params(colors='white' if play_mode == "Tweaked" else 'black')
-            ax1.grid(alpha=0.3, color='white' if play_mode == "Tweaked" else 'gray')
-            
-            # Tweaked game histogram
-            ax2.hist(tweaked['profits'], bins=40, alpha=0.8, color='#e74c3c', edgecolor='black')
-            ax2.set_title("Tweaked Game - Profit Distribution", fontsize=14, color='white' if play_mode == "Tweaked" else 'black')
-            ax2.set_xlabel("Profit per Play ($)", fontsize=11, color='white' if play_mode == "Tweaked" else 'black')
-            ax2.set_ylabel("Frequency", fontsize=11, color='white' if play_mode == "Tweaked" else 'black')
-            ax2.axvline(tweaked['mean'], color='darkred', linestyle='--', linewidth=2, label=f"Mean: ${tweaked['mean']:.4f}")
-            ax2.legend()
-            ax2.set_facecolor('#16213e' if play_mode == "Tweaked" else 'white')
-            ax2.tick_params(colors='white' if play_mode == "Tweaked" else 'black')
-            ax2.grid(alpha=0.3, color='white' if play_mode == "Tweaked" else 'gray')
-            
-            plt.tight_layout()
-            st.pyplot(fig)
-            plt.close()
+            png = get_figure_cache().render(
+                (st.session_state.sim_id, "hist", play_mode),
+                lambda: build_distribution_figure(fair, tweaked, play_mode),
+            )
+            st.image(png, use_container_width=True)
         
         with tab_cum:
-            fig, ax = plt.subplots(figsize=(14, 6))
-            fig.patch.set_facecolor('#1a1a2e' if play_mode == "Tweaked" else '#f0f2f6')
-            
-            ax.plot(np.cumsum(fair['profits']), label='Fair Game', linewidth=2.5, color='#10b981', alpha=0.9)
-            ax.plot(np.cumsum(tweaked['profits']), label='Tweaked Game', linewidth=2.5, color='#e74c3c', alpha=0.9)
-            ax.axhline(y=0, color='white' if play_mode == "Tweaked" else 'gray', linestyle='--', alpha=0.7)
-            ax.set_title("Cumulative Profit Over Time", fontsize=16, color='white' if play_mode == "Tweaked" else 'black')
-            ax.set_xlabel("Play Number", fontsize=12, color='white' if play_mode == "Tweaked" else 'black')
-            ax.set_ylabel("Total Profit ($)", fontsize=12, color='white' if play_mode == "Tweaked" else 'black')
-            ax.legend(fontsize=12)
-            ax.set_facecolor('#16213e' if play_mode == "Tweaked" else 'white')
-            ax.tick_params(colors='white' if play_mode == "Tweaked" else 'black')
-            ax.grid(alpha=0.3, color='white' if play_mode == "Tweaked" else 'gray')
+            png = get_figure_cache().render(
+                (st.session_state.sim_id, "cumulative", play_mode),
+                lambda: build_cumulative_figure(fair, tweaked, play_mode),
+            )
+            st.image(png, use_container_width=True)
             
-            plt.tight_layout()
-            st.pyplot(fig)
-            plt.close()
+            png = get_figure_cache().render(
+                (st.session_state.sim_id, "convergence", play_mode),
+                lambda: build_convergence_figure(fair, tweaked, play_mode),
+            )
+            st.image(png, use_container_width=True)
         
         with tab_compare:
             # Summary table
@@ -652,6 +820,19 @@ with tab2:
             
             st.dataframe(comparison_df, use_container_width=True, hide_index=True)
             
+            st.markdown("### 📉 Risk Metrics")
+            fair_risk, tweaked_risk = fair['risk'], tweaked['risk']
+            risk_df = pd.DataFrame({
+                'Metric': ['Max Drawdown ($)', 'Longest Losing Streak',
+                          f"Plays Until Down ${fair_risk['ruin_level']:,.2f}"] +
+                          [f"P{q*100:.0f} Profit per {fair_risk['block_size']} Plays ($)" for q in fair_risk['block_quantiles']] +
+                          [f"Profit After {cp:,} Plays ($)" for cp in fair_risk['checkpoints']],
+                'Fair Game': risk_column(fair_risk),
+                'Tweaked Game': risk_column(tweaked_risk)
+            })
+            
+            st.dataframe(risk_df, use_container_width=True, hide_index=True)
+            
             st.markdown("### 🎯 Analysis")
             house_edge_diff = (tweaked['house_edge'] - fair['house_edge']) * 100
             total_diff = tweaked['total'] - fair['total']
@@ -671,7 +852,9 @@ with tab2:
 
 
 # Tab 3: About
-with tab3:
+@st.fragment
+def about_panel():
+    """Static project information"""
     st.header("About DICE-EM!")
     
     col_about1, col_about2 = st.columns([2, 1])
@@ -692,7 +875,7 @@ with tab3:
         
         #### 🟢 Fair Game (The Honest One):
         - Equal probability: 16.67% for each color
-        - Fair payout: 5:1 (bet $10, win $50, net +$40)
+        - Fair payout: 5:1 (bet $10 and win: you keep your $10 plus $50, net +$50)
         - Expected value: $0 (neither you nor the house makes money... in theory)
         - **Reality check**: It's fair, but you'll still probably lose
         
@@ -783,6 +966,17 @@ with tab3:
         
         """)
 
+tab1, tab2, tab3 = st.tabs(["🎮 Play Now", "📊 Run Simulation", "ℹ️ About"])
+
+with tab1:
+    play_panel(play_mode, bet_amount, difficulty)
+
+with tab2:
+    simulation_panel(play_mode)
+
+with tab3:
+    about_panel()
+
 # Footer
 st.markdown("---")
 st.markdown("""